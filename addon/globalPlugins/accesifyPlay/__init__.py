@@ -10,8 +10,8 @@ import wx
 import gui
 from gui import settingsDialogs
 import config
-import threading
 import time
+from concurrent.futures import wait, FIRST_COMPLETED, TimeoutError as FutureTimeoutError
 from logHandler import log
 import addonHandler
 import webbrowser
@@ -45,6 +45,7 @@ confspec = {
     "seekDuration": "integer(min=1, max=60, default=15)",
     "language": "string(default='auto')",
     "announceTrackChanges": "boolean(default=False)",
+    "searchAsYouType": "boolean(default=True)",
     "keepAliveInterval": "integer(min=0, default=30)",
     "updateChannel": "string(default='stable')",
     "isAutomaticallyCheckForUpdates": "boolean(default=True)",
@@ -52,6 +53,39 @@ confspec = {
 }
 config.conf.spec["spotify"] = confspec
 
+# Management dialog data that must be ready before the dialog opens; other tabs fill in later.
+MANAGEMENT_CRITICAL_KEYS = ("user_profile", "playlists")
+# Seconds to wait for any single Management loader before giving up on it.
+MANAGEMENT_LOADER_TIMEOUT = 30
+# How often (in seconds) loaders still running in the background are checked for a timeout.
+MANAGEMENT_TIMEOUT_CHECK_INTERVAL = 1.0
+
+# Track change polling (all in seconds). While playing, the next check is due just after
+# the current track should end, and at least every POLL_PLAYING_MAX to notice changes
+# made on other devices. Near the boundary, confirmation checks repeat every
+# POLL_CONFIRM_INTERVAL until the new track shows up.
+POLL_BOUNDARY_DELAY = 0.5
+POLL_CONFIRM_INTERVAL = 1.0
+POLL_PLAYING_MAX = 30.0
+# While paused or idle the interval doubles from POLL_IDLE_BASE up to POLL_IDLE_MAX.
+POLL_IDLE_BASE = 10.0
+POLL_IDLE_MAX = 120.0
+# How often to look at the settings again while announcements are turned off.
+POLL_DISABLED_INTERVAL = 5.0
+# After a playback command sent from NVDA, Spotify gets this long before we check.
+POLL_AFTER_COMMAND_DELAY = 1.0
+# Keep-alive pings are never sent more often than this (in seconds).
+KEEP_ALIVE_MIN_INTERVAL = 5
+# Playback gestures run one at a time; this many presses may wait behind the running
+# one before further presses are answered with "Please wait...".
+PLAYBACK_MAX_PENDING = 1
+# Volume, seek and toggle presses only update local state, so they get their own keys
+# and are never refused.
+VOLUME_TASK_KEY = "volume"
+SEEK_TASK_KEY = "seek"
+TOGGLE_TASK_KEY = "toggle"
+VOLUME_STEP = 5
+
 language._apply_language_preference()
 
 class GlobalPlugin(globalPluginHandler.GlobalPlugin):
@@ -59,7 +93,6 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
     
     def __init__(self):
         super(GlobalPlugin, self).__init__()
-        self._is_modifying_playback = False
         self.client = spotify_client.get_client()
         
         # Inisialisasi semua dialog ke None
@@ -75,28 +108,33 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
         self._queueDialogLoading = False
         self._addToPlaylistLoading = False
         self._managementDialogLoading = False
+        self._managementDialogGeneration = 0
         self._devicesDialogLoading = False
         
         settingsDialogs.NVDASettingsDialog.categoryClasses.append(SpotifySettingsPanel)
 
         # Polling untuk perubahan lagu
         self.last_track_id = None
-        self.is_running = True
-        self.polling_thread = threading.Thread(target=self.track_change_poller)
-        self.polling_thread.daemon = True
-        self.polling_thread.start()
-
-        self.keep_alive_thread = threading.Thread(target=self.keep_alive_worker)
-        self.keep_alive_thread.daemon = True
-        self.keep_alive_thread.start()
-
-        threading.Thread(target=self.client.initialize).start()
+        self._idle_polls = 0
+        self.client.add_playback_command_listener(self._on_playback_command)
+        # Polling and keep-alive run as jobs on the client's heartbeat thread.
+        self.client.heartbeat.add_job("track_poll", self.track_change_poll)
+        self.client.heartbeat.add_job(
+            "keep_alive", self.keep_alive_job, delay=KEEP_ALIVE_MIN_INTERVAL
+        )
+        self.client.heartbeat.start()
+
+        utils.submit(self.client.initialize, background=True)
         if config.conf["spotify"]["isAutomaticallyCheckForUpdates"]:
-            threading.Thread(target=updater.check_for_updates, args=(False,)).start()
+            updater.check_for_updates(False)
 
     def terminate(self):
         super(GlobalPlugin, self).terminate()
-        self.is_running = False
+        self.client.remove_playback_command_listener(self._on_playback_command)
+        self.client.heartbeat.remove_job("track_poll")
+        self.client.heartbeat.remove_job("keep_alive")
+        self.client.shutdown()
+        utils.shutdown_tasks()
         try:
             settingsDialogs.NVDASettingsDialog.categoryClasses.remove(SpotifySettingsPanel)
         except (ValueError, AttributeError):
@@ -108,49 +146,66 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
             if dialog:
                 dialog.Destroy()
 
-    def track_change_poller(self):
-        """Thread latar belakang yang mengecek perubahan lagu."""
-        while self.is_running:
-            try:
-                if config.conf["spotify"]["announceTrackChanges"] and self.client.client:
-                    playback = self.client._execute_web_api(self.client.client.current_playback)
-                    current_track_id = playback.get("item", {}).get("id") if playback and isinstance(playback, dict) else None
-
-                    if self.last_track_id != current_track_id:
-                        self.last_track_id = current_track_id
-                        if current_track_id:
-                            track_string = self.client.get_simple_track_string(playback["item"])
-                            wx.CallAfter(ui.message, track_string)
-            except Exception as e:
-                log.error(f"Error in Spotify polling thread: {e}", exc_info=True)
-            
-            for _ in range(5):
-                if not self.is_running:
-                    return
-                time.sleep(1)
-
-    def keep_alive_worker(self):
-        """Thread untuk mengirim ping ke Spotify agar koneksi tetap hidup."""
-        while self.is_running:
-            interval = config.conf["spotify"]["keepAliveInterval"]
-            
-            if interval == 0:
-                time.sleep(5)
-                continue
-            
-            if interval < 5:
-                interval = 5
+    def _on_playback_command(self):
+        # A playback command was sent from NVDA; look again shortly.
+        self._idle_polls = 0
+        self.client.heartbeat.run_soon("track_poll", POLL_AFTER_COMMAND_DELAY)
 
-            try:
-                if self.client.client:
-                    self.client.send_keep_alive()
-            except Exception:
-                pass
-            
-            for _ in range(interval):
-                if not self.is_running:
-                    break
-                time.sleep(1)
+    def track_change_poll(self):
+        """Heartbeat job that announces track changes. Returns the seconds until the next check."""
+        if not config.conf["spotify"]["announceTrackChanges"] or not self.client.client:
+            return POLL_DISABLED_INTERVAL
+        try:
+            with self.client.background_requests():
+                playback = self.client.get_playback_state(ensure_device=False)
+            current_track_id = playback.get("item", {}).get("id") if playback and isinstance(playback, dict) else None
+
+            if self.last_track_id != current_track_id:
+                self.last_track_id = current_track_id
+                if current_track_id:
+                    track_string = self.client.get_simple_track_string(playback["item"])
+                    wx.CallAfter(ui.message, track_string)
+        except Exception as e:
+            log.error(f"Error in Spotify polling thread: {e}", exc_info=True)
+            return POLL_DISABLED_INTERVAL
+        delay, self._idle_polls = self._next_poll_delay(playback, self._idle_polls)
+        return delay
+
+    def _next_poll_delay(self, playback, idle_polls):
+        """Returns (seconds until the next poll, updated idle poll count)."""
+        item = playback.get("item") if isinstance(playback, dict) else None
+        if not item or not playback.get("is_playing"):
+            idle_polls += 1
+            return min(POLL_IDLE_BASE * 2 ** (idle_polls - 1), POLL_IDLE_MAX), idle_polls
+
+        duration_ms = item.get("duration_ms") or 0
+        progress_ms = playback.get("progress_ms") or 0
+        remaining = max(0.0, (duration_ms - progress_ms) / 1000)
+        delay = max(remaining + POLL_BOUNDARY_DELAY, POLL_CONFIRM_INTERVAL)
+        return min(delay, POLL_PLAYING_MAX), 0
+
+    def keep_alive_job(self):
+        """
+        Heartbeat job that keeps the connection to Spotify warm.
+        Any request that succeeded within the interval already did that, so a ping
+        is only sent after a quiet period. Returns the seconds until the next check.
+        """
+        interval = config.conf["spotify"]["keepAliveInterval"]
+        if interval == 0:
+            return POLL_DISABLED_INTERVAL
+        interval = max(interval, KEEP_ALIVE_MIN_INTERVAL)
+        if not self.client.client:
+            return interval
+
+        idle_for = self.client.seconds_since_last_response()
+        if idle_for is not None and idle_for < interval:
+            return interval - idle_for
+        with self.client.background_requests():
+            self.client.send_keep_alive()
+        return interval
+
+    def _announce_later(self, message):
+        wx.CallAfter(ui.message, message)
 
     def _set_clipboard(self, text):
         """Metode aman untuk mengakses clipboard dari main thread."""
@@ -209,165 +264,89 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
         description=_("Play or pause the current track on Spotify."),
         gesture="kb:nvda+shift+alt+space",
     )
-    @utils.speak_in_thread
+    @utils.speak_in_thread(key=TOGGLE_TASK_KEY)
     def script_playPause(self, gesture):
-        if self._is_modifying_playback:
-            return _("Please wait...")
-        try:
-            self._is_modifying_playback = True
-            playback = self.client._execute(self.client.client.current_playback)
-            if not isinstance(playback, dict):
-                return playback
-            if playback and playback.get("is_playing"):
-                self.client._execute(self.client.client.pause_playback)
-                return _("Paused")
-            else:
-                self.client._execute(self.client.client.start_playback)
-                return _("Playing")
-        finally:
-            self._is_modifying_playback = False
+        return self.client.toggle_playback(on_message=self._announce_later)
 
     @scriptHandler.script(
         description=_("Skip to the next track on Spotify."),
         gesture="kb:nvda+shift+alt+rightArrow",
     )
-    @utils.speak_in_thread
+    @utils.speak_in_thread(key=utils.PLAYBACK_TASK_KEY, max_pending=PLAYBACK_MAX_PENDING)
     def script_nextTrack(self, gesture):
-        if self._is_modifying_playback:
-            return _("Please wait...")
-        try:
-            self._is_modifying_playback = True
-            result = self.client._execute(self.client.client.next_track)
-            if isinstance(result, str):
-                return result
-            time.sleep(0.4)  # Beri jeda agar server Spotify sempat memproses
-            playback = self.client._execute(self.client.client.current_playback)
-            return self.client.get_current_track_info(playback) if isinstance(playback, dict) else _("Next track")
-        finally:
-            self._is_modifying_playback = False
+        return self.client.skip_next(on_message=self._announce_later)
 
     @scriptHandler.script(
         description=_("Skip to the previous track on Spotify."),
         gesture="kb:nvda+shift+alt+leftArrow",
     )
-    @utils.speak_in_thread
+    @utils.speak_in_thread(key=utils.PLAYBACK_TASK_KEY, max_pending=PLAYBACK_MAX_PENDING)
     def script_previousTrack(self, gesture):
-        if self._is_modifying_playback:
-            return _("Please wait...")
-        try:
-            self._is_modifying_playback = True
-            result = self.client._execute(self.client.client.previous_track)
-            if isinstance(result, str):
-                return result
-            time.sleep(0.4)
-            playback = self.client._execute(self.client.client.current_playback)
-            return self.client.get_current_track_info(playback) if isinstance(playback, dict) else _("Previous track")
-        finally:
-            self._is_modifying_playback = False
+        return self.client.skip_previous()
 
     @scriptHandler.script(
         description=_("Increase Spotify volume."), gesture="kb:nvda+shift+alt+upArrow"
     )
-    @utils.speak_in_thread
+    @utils.speak_in_thread(key=VOLUME_TASK_KEY)
     def script_volumeUp(self, gesture):
-        if self._is_modifying_playback:
-            return _("Please wait...")
-        try:
-            self._is_modifying_playback = True
-            playback = self.client._execute(self.client.client.current_playback)
-            if not isinstance(playback, dict): return playback
-            if playback and playback.get("device"):
-                current_volume = playback["device"]["volume_percent"]
-                new_volume = min(current_volume + 5, 100)
-                self.client._execute(self.client.client.volume, new_volume)
-                return f"{_('Volume')} {new_volume}%"
-            return _("No active device found.")
-        finally:
-            self._is_modifying_playback = False
+        volume = self.client.adjust_volume(+VOLUME_STEP, on_error=self._announce_later)
+        if isinstance(volume, str):
+            return volume
+        return f"{_('Volume')} {volume}%"
 
     @scriptHandler.script(
         description=_("Decrease Spotify volume."), gesture="kb:nvda+shift+alt+downArrow"
     )
-    @utils.speak_in_thread
+    @utils.speak_in_thread(key=VOLUME_TASK_KEY)
     def script_volumeDown(self, gesture):
-        if self._is_modifying_playback:
-            return _("Please wait...")
-        try:
-            self._is_modifying_playback = True
-            playback = self.client._execute(self.client.client.current_playback)
-            if not isinstance(playback, dict): return playback
-            if playback and playback.get("device"):
-                current_volume = playback["device"]["volume_percent"]
-                new_volume = max(current_volume - 5, 0)
-                self.client._execute(self.client.client.volume, new_volume)
-                return f"{_('Volume')} {new_volume}%"
-            return _("No active device found.")
-        finally:
-            self._is_modifying_playback = False
+        volume = self.client.adjust_volume(-VOLUME_STEP, on_error=self._announce_later)
+        if isinstance(volume, str):
+            return volume
+        return f"{_('Volume')} {volume}%"
     
     @scriptHandler.script(
         description=_("Seek forward in the current track."),
         gesture="kb:control+alt+nvda+rightArrow",
     )
-    @utils.speak_in_thread
+    @utils.speak_in_thread(key=SEEK_TASK_KEY)
     def script_seekForward(self, gesture):
-        if self._is_modifying_playback:
-            return _("Please wait...")
-        try:
-            self._is_modifying_playback = True
-            seek_duration = config.conf["spotify"]["seekDuration"]
-            result = self.client.seek_track(seek_duration * 1000)
-            if isinstance(result, str): return result
-            return _("Seeked forward {duration} seconds.").format(duration=seek_duration)
-        finally:
-            self._is_modifying_playback = False
+        seek_duration = config.conf["spotify"]["seekDuration"]
+        result = self.client.seek_relative(
+            seek_duration * 1000, on_error=self._announce_later
+        )
+        if isinstance(result, str): return result
+        return _("Seeked forward {duration} seconds.").format(duration=seek_duration)
 
     @scriptHandler.script(
         description=_("Seek backward in the current track."),
         gesture="kb:control+alt+nvda+leftArrow",
     )
-    @utils.speak_in_thread
+    @utils.speak_in_thread(key=SEEK_TASK_KEY)
     def script_seekBackward(self, gesture):
-        if self._is_modifying_playback:
-            return _("Please wait...")
-        try:
-            self._is_modifying_playback = True
-            seek_duration = config.conf["spotify"]["seekDuration"]
-            result = self.client.seek_track(-seek_duration * 1000)
-            if isinstance(result, str): return result
-            return _("Seeked backward {duration} seconds.").format(duration=seek_duration)
-        finally:
-            self._is_modifying_playback = False
+        seek_duration = config.conf["spotify"]["seekDuration"]
+        result = self.client.seek_relative(
+            -seek_duration * 1000, on_error=self._announce_later
+        )
+        if isinstance(result, str): return result
+        return _("Seeked backward {duration} seconds.").format(duration=seek_duration)
 
     @scriptHandler.script(
         description=_("Toggle Shuffle mode."),
         gesture="kb:nvda+alt+shift+h",
     )
-    @utils.speak_in_thread
+    @utils.speak_in_thread(key=TOGGLE_TASK_KEY)
     def script_toggleShuffle(self, gesture):
         # H = sHuffle (S is already used as Search)
-        if self._is_modifying_playback:
-            return _("Please wait...")
-        try:
-            self._is_modifying_playback = True
-            return self.client.toggle_shuffle()
-        finally:
-            self._is_modifying_playback = False
+        return self.client.toggle_shuffle(on_message=self._announce_later)
 
     @scriptHandler.script(
         description=_("Cycle Repeat mode (Off, Context, Track)."),
         gesture="kb:nvda+alt+shift+r",
     )
-    @utils.speak_in_thread
+    @utils.speak_in_thread(key=TOGGLE_TASK_KEY)
     def script_cycleRepeat(self, gesture):
         # R = Repeat
-        if self._is_modifying_playback:
-            return _("Please wait...")
-        try:
-            self._is_modifying_playback = True
-            return self.client.cycle_repeat()
-        finally:
-            self._is_modifying_playback = False
+        return self.client.cycle_repeat(on_message=self._announce_later)
 
     @scriptHandler.script(
         description=_("Announce the next track in the queue."),
@@ -383,7 +362,7 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
     )
     @utils.speak_in_thread
     def script_saveTrackToLibrary(self, gesture):
-        playback = self.client._execute(self.client.client.current_playback)
+        playback = self.client.get_playback_state()
         if isinstance(playback, str): return playback
         if not playback or not playback.get("item"):
             return _("Nothing is currently playing.")
@@ -399,7 +378,7 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
     )
     @utils.speak_in_thread
     def script_toggleFollowArtist(self, gesture):
-        playback = self.client._execute(self.client.client.current_playback)
+        playback = self.client.get_playback_state()
         if isinstance(playback, str):
             return playback
         if not playback or not playback.get("item"):
@@ -531,7 +510,7 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 
         @utils.run_in_thread
         def _prepare():
-            playback = self.client._execute(self.client.client.current_playback)
+            playback = self.client.get_playback_state()
             if not isinstance(playback, dict) or not playback.get("item"):
                 wx.CallAfter(self._finish_add_to_playlist_dialog, _("Nothing is currently playing."))
                 return
@@ -580,17 +559,25 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
             return
         
         self._managementDialogLoading = True
+        self._managementDialogGeneration += 1
+        generation = self._managementDialogGeneration
         ui.message(_("Please Wait..."))
 
-        @utils.run_in_thread
+        @utils.run_in_thread(background=True)
         def _prepare():
-            data = self._fetch_management_data()
-            wx.CallAfter(self._finish_management_dialog_load, data)
+            data, pending = self._fetch_management_data()
+            wx.CallAfter(self._finish_management_dialog_load, generation, data, pending)
         _prepare()
 
     def _fetch_management_data(self):
-        """Gets all the data needed for ManagementDialog."""
-        data = {}
+        """
+        Queues every loader needed by ManagementDialog on the background pool.
+        Waits only for the critical ones, running any that no worker has picked up yet
+        on this thread, and returns (data, pending), where pending
+        maps the remaining keys to (future, started) pairs that finish in the background;
+        started[0] is set to the monotonic time the loader began running.
+        On failure of a critical loader, data is an error message.
+        """
         loaders = {
             "user_profile": self.client.get_current_user_profile,
             "playlists": self.client.get_user_playlists,
@@ -602,19 +589,82 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
             "new_releases": self.client.get_new_releases,
             "recently_played": self.client.get_recently_played,
         }
+        futures = {}
+        started = {}
         for key, func in loaders.items():
-            result = func()
-            if isinstance(result, str): return result # return error message on failure
+            started[key] = [None]
+            # Tabs the dialog can open without are prefetched behind interactive requests.
+            background = key not in MANAGEMENT_CRITICAL_KEYS
+            futures[key] = utils.submit_future(
+                self._run_management_loader, args=(func, started[key], background), background=True
+            )
+
+        data = {}
+        for key in MANAGEMENT_CRITICAL_KEYS:
+            try:
+                if futures[key].cancel():
+                    result = self._run_management_loader(loaders[key], started[key], False)
+                else:
+                    result = futures[key].result(timeout=MANAGEMENT_LOADER_TIMEOUT)
+            except FutureTimeoutError:
+                return _("Timed out while loading your Spotify library."), {}
+            if isinstance(result, str):
+                return result, {}  # return error message on failure
             data[key] = result
-        return data
+        pending = {key: (future, started[key]) for key, future in futures.items() if key not in data}
+        return data, pending
+
+    def _run_management_loader(self, func, started, background):
+        started[0] = time.monotonic()
+        if not background:
+            return func()
+        with self.client.background_requests():
+            return func()
 
-    def _finish_management_dialog_load(self, data):
+    def _finish_management_dialog_load(self, generation, data, pending):
         self._managementDialogLoading = False
         if isinstance(data, str):
             ui.message(data)
             return
-        self._open_dialog(ManagementDialog, "managementDialog", preloaded_data=data)
+        self._open_dialog(
+            ManagementDialog, "managementDialog", preloaded_data=data, pending_keys=set(pending)
+        )
         ui.message(_("UI Ready."))
+        if pending:
+            self._deliver_pending_management_data(generation, pending)
+
+    @utils.run_in_thread(background=True)
+    def _deliver_pending_management_data(self, generation, pending):
+        """
+        Hands each background loader result to the Management dialog as it arrives.
+        Each loader gets MANAGEMENT_LOADER_TIMEOUT seconds from the moment it started running.
+        """
+        remaining = {future: (key, started) for key, (future, started) in pending.items()}
+        while remaining and generation == self._managementDialogGeneration:
+            done, _not_done = wait(
+                remaining, timeout=MANAGEMENT_TIMEOUT_CHECK_INTERVAL, return_when=FIRST_COMPLETED
+            )
+            for future in done:
+                key = remaining.pop(future)[0]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    log.error(f"Management loader '{key}' failed: {e}", exc_info=True)
+                    result = _("An unexpected error occurred.")
+                wx.CallAfter(self._apply_management_data, generation, key, result)
+            now = time.monotonic()
+            for future, (key, started) in list(remaining.items()):
+                if started[0] is not None and now - started[0] > MANAGEMENT_LOADER_TIMEOUT:
+                    del remaining[future]
+                    wx.CallAfter(
+                        self._apply_management_data, generation, key,
+                        _("Timed out while loading this tab."),
+                    )
+
+    def _apply_management_data(self, generation, key, result):
+        # Results meant for an earlier opening of the dialog are dropped.
+        if self.managementDialog and generation == self._managementDialogGeneration:
+            self.managementDialog.apply_loaded_data(key, result)
         
     @scriptHandler.script(
         description=_("Show available devices to switch playback."),
@@ -1,6 +1,6 @@
 import wx
 import ui
-import threading
+from .. import utils
 
 class AccessifyDialog(wx.Dialog):
     """
@@ -17,6 +17,14 @@ class AccessifyDialog(wx.Dialog):
 
         self.client = None
         self._is_queuing = False
+        self._queue_task = None
+        self.Bind(wx.EVT_WINDOW_DESTROY, self._on_base_destroy, self)
+
+    def _on_base_destroy(self, evt):
+        # Stop a bulk queue operation that belongs to a dialog being closed.
+        if self._queue_task:
+            self._queue_task.cancel()
+        evt.Skip()
 
     def bind_close_button(self, button):
         button.Bind(wx.EVT_BUTTON, self._on_close_button)
@@ -50,7 +58,7 @@ class AccessifyDialog(wx.Dialog):
             ui.message(_("Unable to play selection. URI not found."))
             return
         ui.message(_("Playing..."))
-        threading.Thread(target=self.client.play_item, args=(uri,)).start()
+        utils.submit(self.client.play_item, args=(uri,), key=utils.PLAYBACK_TASK_KEY)
 
     def _queue_add_track(self, uri, name):
         """Adds a single track to the queue."""
@@ -65,9 +73,7 @@ class AccessifyDialog(wx.Dialog):
         
         self._is_queuing = True
         ui.message(_("Adding to queue..."))
-        threading.Thread(
-            target=self._queue_add_track_thread, args=(uri, name)
-        ).start()
+        utils.submit(self._queue_add_track_thread, args=(uri, name))
 
     def _queue_add_track_thread(self, uri, name):
         try:
@@ -90,10 +96,9 @@ class AccessifyDialog(wx.Dialog):
             return
         self._is_queuing = True
         ui.message(_("Adding to queue..."))
-        threading.Thread(
-            target=self._queue_add_context_thread,
-            args=(uri, item_type, name),
-        ).start()
+        self._queue_task = utils.submit(
+            self._queue_add_context_thread, args=(uri, item_type, name), background=True
+        )
 
     def _queue_add_context_thread(self, uri, item_type, name):
         try:
@@ -105,17 +110,29 @@ class AccessifyDialog(wx.Dialog):
                 if not track_uris:
                     wx.CallAfter(ui.message, _("No tracks were queued."))
                     return
-                added = 0
-                for track_uri in track_uris:
-                    result = self.client.add_to_queue(track_uri)
-                    if isinstance(result, str):
-                        wx.CallAfter(ui.message, result)
-                        return
-                    added += 1
-                wx.CallAfter(
-                    ui.message,
-                    _("Queued {count} tracks from {name}.").format(count=added, name=name),
+                token = utils.current_token()
+
+                def on_progress(done, total):
+                    wx.CallAfter(
+                        ui.message,
+                        _("Queued {done} of {total} tracks.").format(done=done, total=total),
+                    )
+
+                added, error = self.client.add_many_to_queue(
+                    track_uris, on_progress=on_progress, cancel_event=token
                 )
+                if error:
+                    wx.CallAfter(ui.message, error)
+                elif token.cancelled:
+                    wx.CallAfter(
+                        ui.message,
+                        _("Queueing cancelled after {count} tracks.").format(count=added),
+                    )
+                else:
+                    wx.CallAfter(
+                        ui.message,
+                        _("Queued {count} tracks from {name}.").format(count=added, name=name),
+                    )
             elif item_type in ("artist", "show"):
                 wx.CallAfter(
                     ui.message,
@@ -126,6 +143,7 @@ class AccessifyDialog(wx.Dialog):
             else:
                 wx.CallAfter(ui.message, _("Cannot add this item to the queue."))
         finally:
+            self._queue_task = None
             self._is_queuing = False
 
     def _save_album_to_library(self, album):
@@ -137,9 +155,7 @@ class AccessifyDialog(wx.Dialog):
             return
 
         ui.message(_("Saving '{album_name}' to your library...").format(album_name=album.get("name")))
-        threading.Thread(
-            target=self._save_album_thread, args=(album,)
-        ).start()
+        utils.submit(self._save_album_thread, args=(album,))
 
     def _save_album_thread(self, album):
         album_id = album.get("id")
@@ -159,9 +175,7 @@ class AccessifyDialog(wx.Dialog):
             return
 
         ui.message(_("Saving '{show_name}' to your library...").format(show_name=show.get("name")))
-        threading.Thread(
-            target=self._save_show_thread, args=(show,)
-        ).start()
+        utils.submit(self._save_show_thread, args=(show,))
 
     def _save_show_thread(self, show):
         show_id = show.get("id")
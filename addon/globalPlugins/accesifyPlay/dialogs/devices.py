@@ -1,6 +1,6 @@
 import wx
 import ui
-import threading
+from .. import utils
 from .base import AccessifyDialog
 
 class DevicesDialog(AccessifyDialog):
@@ -68,7 +68,7 @@ class DevicesDialog(AccessifyDialog):
         
         # Tutup dialog dan mulai proses pemindahan di thread lain
         self.Close()
-        threading.Thread(target=self._change_device_thread, args=(device_id,)).start()
+        utils.submit(self._change_device_thread, args=(device_id,), key=utils.PLAYBACK_TASK_KEY)
         
     def _change_device_thread(self, device_id):
         result = self.client.transfer_playback_to_device(device_id)
@@ -1,9 +1,9 @@
 import wx
 import ui
-import threading
 import config
 from gui import guiHelper, messageBox
 import gui
+from .. import utils
 from .base import AccessifyDialog
 
 def _get_search_limit(default_value):
@@ -66,10 +66,7 @@ class CreatePlaylistDialog(AccessifyDialog):
             return
         self._creating = True
         self.createButton.Disable()
-        threading.Thread(
-            target=self._create_thread,
-            args=(name, description, public, collaborative),
-        ).start()
+        utils.submit(self._create_thread, args=(name, description, public, collaborative))
 
     def _create_thread(self, name, description, public, collaborative):
         result = self.client.create_playlist(name, public, collaborative, description)
@@ -144,10 +141,7 @@ class PlaylistDetailsDialog(AccessifyDialog):
             return
         self._saving = True
         self.saveButton.Disable()
-        threading.Thread(
-            target=self._save_thread,
-            args=(name, description, public, collaborative),
-        ).start()
+        utils.submit(self._save_thread, args=(name, description, public, collaborative))
 
     def _save_thread(self, name, description, public, collaborative):
         result = self.client.update_playlist_details(
@@ -261,7 +255,7 @@ class AddToPlaylistDialog(AccessifyDialog):
             wx.CallAfter(self.Close)
 
         ui.message(_("Adding to playlist..."))
-        threading.Thread(target=_add).start()
+        utils.submit(_add)
         # Nonaktifkan tombol untuk mencegah klik ganda
         self.add_button.Disable()
 
@@ -336,7 +330,7 @@ class PodcastEpisodesDialog(AccessifyDialog):
         if not self.episodes:
             self.episodes_list.Clear()
             self.episodes_list.Append(_("Loading..."))
-        threading.Thread(target=self._load_more_episodes_thread).start()
+        utils.submit(self._load_more_episodes_thread)
 
     def _load_more_episodes_thread(self):
         results = self.client.get_show_episodes(
@@ -454,10 +448,11 @@ class PodcastEpisodesDialog(AccessifyDialog):
 
         if show_uri and episode_uri:
             ui.message(_("Playing."))
-            threading.Thread(
-                target=self.client.play_context_with_offset,
+            utils.submit(
+                self.client.play_context_with_offset,
                 args=(show_uri, episode_uri),
-            ).start()
+                key=utils.PLAYBACK_TASK_KEY,
+            )
         else:
             self._play_uri(episode_uri)
 
@@ -475,6 +470,8 @@ class PodcastEpisodesDialog(AccessifyDialog):
 
 class ArtistDiscographyDialog(AccessifyDialog):
     DEFAULT_ALL_TRACKS_BATCH_SIZE = 40
+    # Albums whose tracks are requested together when the All Tracks buffer runs out.
+    ALL_TRACKS_ALBUM_CHUNK = 40
     MENU_PLAY = wx.NewIdRef()
     MENU_ADD_QUEUE = wx.NewIdRef()
     MENU_COPY_LINK = wx.NewIdRef()
@@ -491,7 +488,8 @@ class ArtistDiscographyDialog(AccessifyDialog):
         self.artist_info = None
         self._all_tracks_seen_ids = set()
         self._all_tracks_album_index = 0
-        self._current_album_tracks = []
+        self._pending_album_tracks = []
+        self._pending_tracks_cursor = 0
         self._all_tracks_loading = False
         self._all_tracks_can_load_more = False
         self._all_tracks_load_more_label = f"--- {_('Load More')} ---"
@@ -578,7 +576,7 @@ class ArtistDiscographyDialog(AccessifyDialog):
         self.Bind(wx.EVT_MENU, self.on_copy_link, id=self.MENU_COPY_LINK.GetId())
 
     def load_data(self):
-        threading.Thread(target=self._load_data_thread).start()
+        utils.submit(self._load_data_thread)
 
     def _load_data_thread(self):
         artist_info = self.client.get_artist_details(self.artist_id)
@@ -609,7 +607,8 @@ class ArtistDiscographyDialog(AccessifyDialog):
         self.all_tracks = []
         self._all_tracks_seen_ids = set()
         self._all_tracks_album_index = 0
-        self._current_album_tracks = []
+        self._pending_album_tracks = []
+        self._pending_tracks_cursor = 0
         self._all_tracks_loading = False
         self._all_tracks_can_load_more = bool(self.albums)
         self.all_tracks_list.Clear()
@@ -623,46 +622,58 @@ class ArtistDiscographyDialog(AccessifyDialog):
         if self._all_tracks_loading or not self._all_tracks_can_load_more:
             return
         self._all_tracks_loading = True
-        threading.Thread(target=self._load_more_all_tracks_thread).start()
+        utils.submit(self._load_more_all_tracks_thread)
 
     def _load_more_all_tracks_thread(self):
         batch = []
-        while len(batch) < self.all_tracks_batch_size and (
-            self._current_album_tracks or self._all_tracks_album_index < len(self.albums)
-        ):
-            if not self._current_album_tracks:
+        while len(batch) < self.all_tracks_batch_size:
+            if self._pending_tracks_cursor >= len(self._pending_album_tracks):
                 if self._all_tracks_album_index >= len(self.albums):
                     break
-                album = self.albums[self._all_tracks_album_index]
-                album_id = album.get("id")
-                if not album_id:
-                    self._all_tracks_album_index += 1
-                    continue
-                album_tracks = self.client.get_album_tracks(album_id)
-                if isinstance(album_tracks, str):
-                    wx.CallAfter(self._handle_all_tracks_error, album_tracks)
+                error = self._fetch_next_album_chunk()
+                if error:
+                    wx.CallAfter(self._handle_all_tracks_error, error)
                     return
-                prepared = []
-                for track in album_tracks:
-                    track_id = track.get("id")
-                    if track_id and track_id in self._all_tracks_seen_ids:
-                        continue
-                    prepared.append(self._prepare_track_entry(track, album))
-                self._current_album_tracks = prepared
-                self._all_tracks_album_index += 1
                 continue
 
-            track_entry = self._current_album_tracks.pop(0)
+            track_entry = self._pending_album_tracks[self._pending_tracks_cursor]
+            self._pending_tracks_cursor += 1
             track_id = track_entry.get("id")
             if track_id:
+                if track_id in self._all_tracks_seen_ids:
+                    continue
                 self._all_tracks_seen_ids.add(track_id)
             batch.append(track_entry)
 
-        has_more = bool(self._current_album_tracks) or (
+        has_more = self._pending_tracks_cursor < len(self._pending_album_tracks) or (
             self._all_tracks_album_index < len(self.albums)
         )
         wx.CallAfter(self._finish_loading_all_tracks, batch, has_more)
 
+    def _fetch_next_album_chunk(self):
+        """Loads tracks for the next chunk of albums. Returns an error message on failure."""
+        chunk = self.albums[
+            self._all_tracks_album_index:self._all_tracks_album_index + self.ALL_TRACKS_ALBUM_CHUNK
+        ]
+        self._all_tracks_album_index += len(chunk)
+        tracks_by_album = self.client.get_albums_tracks([album.get("id") for album in chunk])
+        if isinstance(tracks_by_album, str):
+            return tracks_by_album
+
+        prepared = []
+        for album in chunk:
+            for track in tracks_by_album.get(album.get("id"), []):
+                track_id = track.get("id")
+                if track_id and track_id in self._all_tracks_seen_ids:
+                    continue
+                prepared.append(self._prepare_track_entry(track, album))
+        # Drop the entries already handed out so the buffer doesn't grow without bound.
+        self._pending_album_tracks = (
+            self._pending_album_tracks[self._pending_tracks_cursor:] + prepared
+        )
+        self._pending_tracks_cursor = 0
+        return None
+
     def _handle_all_tracks_error(self, message):
         self._all_tracks_loading = False
         self._all_tracks_can_load_more = False
@@ -896,12 +907,12 @@ class ArtistDiscographyDialog(AccessifyDialog):
         ))
         
         def _add_thread():
-            result = self.client.add_track_to_playlist(playlist_id, track_uri)
+            result = self.client.add_track_to_playlist(playlist_id, track_uri, track=track)
             if isinstance(result, str):
                 wx.CallAfter(ui.message, result)
             else:
                 wx.CallAfter(ui.message, _("Track added successfully."))
-        threading.Thread(target=_add_thread).start()
+        utils.submit(_add_thread)
 
 class AlbumTracksDialog(AccessifyDialog):
     MENU_PLAY = wx.NewIdRef()
@@ -975,7 +986,7 @@ class AlbumTracksDialog(AccessifyDialog):
         self._loading = True
         self.tracks_list.Clear()
         self.tracks_list.Append(_("Loading..."))
-        threading.Thread(target=self._load_tracks_thread).start()
+        utils.submit(self._load_tracks_thread)
 
     def _load_tracks_thread(self):
         album_id = self.album.get("id")
@@ -1059,10 +1070,11 @@ class AlbumTracksDialog(AccessifyDialog):
 
         if album_uri and track_uri:
             ui.message(_("Playing from album..."))
-            threading.Thread(
-                target=self.client.play_context_with_offset,
+            utils.submit(
+                self.client.play_context_with_offset,
                 args=(album_uri, track_uri),
-            ).start()
+                key=utils.PLAYBACK_TASK_KEY,
+            )
         else:
             self._play_uri(track_uri)
 
@@ -1092,13 +1104,13 @@ class AlbumTracksDialog(AccessifyDialog):
         ))
 
         def _add_thread():
-            result = self.client.add_track_to_playlist(playlist_id, track_uri)
+            result = self.client.add_track_to_playlist(playlist_id, track_uri, track=track)
             if isinstance(result, str):
                 wx.CallAfter(ui.message, result)
             else:
                 wx.CallAfter(ui.message, _("Track added successfully."))
 
-        threading.Thread(target=_add_thread).start()
+        utils.submit(_add_thread)
 
 
 class PlaylistTracksDialog(AccessifyDialog):
@@ -1186,7 +1198,7 @@ class PlaylistTracksDialog(AccessifyDialog):
         if not self.tracks:
             self.tracks_list.Clear()
             self.tracks_list.Append(_("Loading..."))
-        threading.Thread(target=self._load_more_tracks_thread).start()
+        utils.submit(self._load_more_tracks_thread)
 
     def _load_more_tracks_thread(self):
         playlist_id = self.playlist.get("id")
@@ -1194,7 +1206,10 @@ class PlaylistTracksDialog(AccessifyDialog):
             wx.CallAfter(self._handle_error, _("Playlist information incomplete."))
             return
         results = self.client.get_playlist_tracks_page(
-            playlist_id, limit=self._tracks_page_size, offset=self._tracks_offset
+            playlist_id,
+            limit=self._tracks_page_size,
+            offset=self._tracks_offset,
+            snapshot_id=self.playlist.get("snapshot_id"),
         )
         wx.CallAfter(self._finish_load_tracks, results)
 
@@ -1328,10 +1343,11 @@ class PlaylistTracksDialog(AccessifyDialog):
 
         if playlist_uri and track_uri:
             ui.message(_("Playing from playlist..."))
-            threading.Thread(
-                target=self.client.play_context_with_offset,
+            utils.submit(
+                self.client.play_context_with_offset,
                 args=(playlist_uri, track_uri),
-            ).start()
+                key=utils.PLAYBACK_TASK_KEY,
+            )
         else:
             self._play_uri(track_uri)
 
@@ -1419,7 +1435,7 @@ class RelatedArtistsDialog(AccessifyDialog):
                 else:
                     for artist in self.related_artists:
                         wx.CallAfter(self.artists_list.Append, artist["name"])
-        threading.Thread(target=_load).start()
+        utils.submit(_load)
 
     def get_selected_artist(self):
         selection = self.artists_list.GetSelection()
@@ -1473,14 +1489,16 @@ class RelatedArtistsDialog(AccessifyDialog):
                 if isinstance(result, str): wx.CallAfter(ui.message, result)
                 else:
                     wx.CallAfter(ui.message, _("You are now following {artist_name}.").format(artist_name=artist["name"]))
-            threading.Thread(target=_follow).start()
+            utils.submit(_follow)
 
 class ManagementDialog(AccessifyDialog):
-    def __init__(self, parent, client, preloaded_data):
+    def __init__(self, parent, client, preloaded_data, pending_keys=None):
         super().__init__(parent, title=_("Spotify Management"), size=(600, 500))
         self.client = client
         
         self.preloaded_data = preloaded_data or {}
+        # Data keys that are still loading in the background; see apply_loaded_data.
+        self.pending_keys = set(pending_keys or ())
         self.current_user_id = self.preloaded_data.get("user_profile", {}).get("id")
         self._createPlaylistDialog = None
         self._playlistDetailsDialog = None
@@ -1561,12 +1579,12 @@ class ManagementDialog(AccessifyDialog):
         ))
         
         def _add_thread():
-            result = self.client.add_track_to_playlist(playlist_id, track_uri)
+            result = self.client.add_track_to_playlist(playlist_id, track_uri, track=track)
             if isinstance(result, str):
                 wx.CallAfter(ui.message, result)
             else:
                 wx.CallAfter(ui.message, _("Track added successfully."))
-        threading.Thread(target=_add_thread).start()
+        utils.submit(_add_thread)
 
     def _handle_refresh(self, evt=None):
         focused_control = self.FindFocus()
@@ -1649,9 +1667,26 @@ class ManagementDialog(AccessifyDialog):
         refresh_button.Bind(wx.EVT_BUTTON, lambda evt, l=loader_func: l())
         sizer.Add(refresh_button, 0, wx.ALIGN_RIGHT | wx.ALL, 5)
         
+        if initial_data_key in self.pending_keys:
+            list_control.Append(_("Loading..."))
+            return
         initial_data = self.preloaded_data.get(initial_data_key)
         loader_func(initial_data=initial_data)
 
+    def apply_loaded_data(self, key, data):
+        """Fills a tab whose data finished loading after the dialog was opened."""
+        if key not in self.pending_keys:
+            return
+        self.pending_keys.discard(key)
+        config = self.tabs_config.get(key)
+        if not config:
+            return
+        if isinstance(data, str):
+            config["control"].Clear()
+            config["control"].Append(_("Unable to load items. Press Alt+R to try again."))
+            return
+        config["loader"](initial_data=data)
+
     def _populate_generic_list(self, key, data):
         config = self.tabs_config.get(key)
         if not config: return
@@ -1680,19 +1715,19 @@ class ManagementDialog(AccessifyDialog):
     
     def load_saved_tracks(self, initial_data=None):
         if initial_data is not None: self._populate_generic_list("saved_tracks", initial_data)
-        else: threading.Thread(target=lambda: self._load_data_thread("saved_tracks", self.client.get_saved_tracks)).start()
+        else: utils.submit(lambda: self._load_data_thread("saved_tracks", self.client.get_saved_tracks))
 
     def load_saved_albums(self, initial_data=None):
         if initial_data is not None: self._populate_generic_list("saved_albums", initial_data)
-        else: threading.Thread(target=lambda: self._load_data_thread("saved_albums", self.client.get_saved_albums)).start()
+        else: utils.submit(lambda: self._load_data_thread("saved_albums", self.client.get_saved_albums))
 
     def load_followed_artists(self, initial_data=None):
         if initial_data is not None: self._populate_generic_list("followed_artists", initial_data)
-        else: threading.Thread(target=lambda: self._load_data_thread("followed_artists", self.client.get_followed_artists)).start()
+        else: utils.submit(lambda: self._load_data_thread("followed_artists", self.client.get_followed_artists))
 
     def load_saved_shows(self, initial_data=None):
         if initial_data is not None: self._populate_generic_list("saved_shows", initial_data)
-        else: threading.Thread(target=lambda: self._load_data_thread("saved_shows", self.client.get_saved_shows)).start()
+        else: utils.submit(lambda: self._load_data_thread("saved_shows", self.client.get_saved_shows))
 
     def load_new_releases(self, initial_data=None):
         if initial_data is not None: self._populate_generic_list("new_releases", initial_data.get("albums", {}).get("items", []))
@@ -1700,7 +1735,7 @@ class ManagementDialog(AccessifyDialog):
             def loader():
                 data = self.client.get_new_releases()
                 return data.get("albums", {}).get("items", []) if isinstance(data, dict) else data
-            threading.Thread(target=lambda: self._load_data_thread("new_releases", loader)).start()
+            utils.submit(lambda: self._load_data_thread("new_releases", loader))
 
     def load_recently_played(self, initial_data=None):
         if initial_data is not None: self._populate_generic_list("recently_played", initial_data.get("items", []))
@@ -1708,7 +1743,7 @@ class ManagementDialog(AccessifyDialog):
             def loader():
                 data = self.client.get_recently_played()
                 return data.get("items", []) if isinstance(data, dict) else data
-            threading.Thread(target=lambda: self._load_data_thread("recently_played", loader)).start()
+            utils.submit(lambda: self._load_data_thread("recently_played", loader))
 
     def init_manage_playlists_tab(self):
         panel = wx.Panel(self.notebook)
@@ -1774,7 +1809,7 @@ class ManagementDialog(AccessifyDialog):
         if initial_data:
             self._populate_playlists_combobox(initial_data)
         else:
-            threading.Thread(target=self._load_playlists_thread).start()
+            utils.submit(self._load_playlists_thread)
 
     def _load_playlists_thread(self):
         data = self.client.get_user_playlists()
@@ -1833,18 +1868,18 @@ class ManagementDialog(AccessifyDialog):
         self.playlist_tracks_list.Clear()
         self.playlist_tracks_list.Append(_("Loading tracks..."))
         
-        self.load_playlist_tracks(playlist_id)
+        self.load_playlist_tracks(playlist_id, selected_playlist.get("snapshot_id"))
         self._update_playlist_controls_state()
 
-    def load_playlist_tracks(self, playlist_id):
+    def load_playlist_tracks(self, playlist_id, snapshot_id=None):
         def _load():
-            tracks_data = self.client.get_playlist_tracks(playlist_id)
+            tracks_data = self.client.get_playlist_tracks(playlist_id, snapshot_id=snapshot_id)
             if isinstance(tracks_data, str):
                 wx.CallAfter(ui.message, tracks_data)
                 wx.CallAfter(self.playlist_tracks_list.Clear)
             else:
                 wx.CallAfter(self._populate_playlist_tracks, tracks_data)
-        threading.Thread(target=_load).start()
+        utils.submit(_load)
 
     def _populate_playlist_tracks(self, tracks_data):
         self.playlist_tracks_list.Clear()
@@ -1924,7 +1959,7 @@ class ManagementDialog(AccessifyDialog):
                 else:
                     wx.CallAfter(ui.message, _("Playlist '{name}' deleted successfully.").format(name=playlist_data["name"]))
                     wx.CallAfter(self.load_playlists)
-            threading.Thread(target=_delete).start()
+            utils.submit(_delete)
 
     def on_unfollow_playlist(self, evt):
         selection_index = self.playlist_choices.GetSelection()
@@ -1945,7 +1980,7 @@ class ManagementDialog(AccessifyDialog):
                 else:
                     wx.CallAfter(ui.message, _("Unfollowed '{name}' successfully.").format(name=playlist_data["name"]))
                     wx.CallAfter(self.load_playlists)
-            threading.Thread(target=_unfollow).start()
+            utils.submit(_unfollow)
 
     def on_remove_track_from_playlist(self, evt=None):
         track_selection = self.playlist_tracks_list.GetSelection()
@@ -1974,7 +2009,7 @@ class ManagementDialog(AccessifyDialog):
                 else:
                     wx.CallAfter(ui.message, _("Track '{track_name}' removed from playlist.").format(track_name=track_data["name"]))
                     wx.CallAfter(self.on_playlist_selected)
-            threading.Thread(target=_remove).start()
+            utils.submit(_remove)
 
     def _handle_reorder_track(self, direction):
         """Handles the logic for reordering a track up or down."""
@@ -2015,10 +2050,7 @@ class ManagementDialog(AccessifyDialog):
 
         # 3. Call the API in the background
         playlist_id = self.user_playlists[playlist_selection]["id"]
-        threading.Thread(
-            target=self._finish_reorder_track,
-            args=(playlist_id, from_index, to_index),
-        ).start()
+        utils.submit(self._finish_reorder_track, args=(playlist_id, from_index, to_index))
 
     def _finish_reorder_track(self, playlist_id, from_index, to_index):
         """The background thread that calls the API and handles the result."""
@@ -2083,7 +2115,10 @@ class ManagementDialog(AccessifyDialog):
         refresh_button.Bind(wx.EVT_BUTTON, self.load_top_items)
         sizer.Add(refresh_button, 0, wx.ALIGN_RIGHT | wx.ALL, 5)
 
-        self.load_top_items(initial_data=self.preloaded_data.get("top_items"))
+        if "top_items" in self.pending_keys:
+            list_control.Append(_("Loading..."))
+        else:
+            self.load_top_items(initial_data=self.preloaded_data.get("top_items"))
 
     def load_top_items(self, evt=None, initial_data=None):
         if initial_data: self._populate_generic_list("top_items", initial_data.get("items", []))
@@ -2093,7 +2128,7 @@ class ManagementDialog(AccessifyDialog):
             def loader():
                 data = self.client.get_top_items(item_type=item_type, time_range=time_range)
                 return data.get("items", []) if isinstance(data, dict) else data
-            threading.Thread(target=lambda: self._load_data_thread("top_items", loader)).start()
+            utils.submit(lambda: self._load_data_thread("top_items", loader))
 
     # --- Shortcut dan Menu Konteks ---
     def _init_shortcuts(self):
@@ -2186,7 +2221,7 @@ class ManagementDialog(AccessifyDialog):
         if not item: return
         msg = _("Are you sure you want to remove '{track_name}' from your library?").format(track_name=item["name"])
         if gui.messageBox(msg, _("Confirm Remove Track"), wx.YES_NO | wx.ICON_WARNING) == wx.YES:
-            threading.Thread(target=self._remove_from_library_thread, args=(item['id'], item['name'])).start()
+            utils.submit(self._remove_from_library_thread, args=(item['id'], item['name']))
 
     def _remove_from_library_thread(self, track_id, track_name):
         result = self.client.remove_tracks_from_library([track_id])
@@ -2200,7 +2235,7 @@ class ManagementDialog(AccessifyDialog):
         if not item: return
         msg = _("Are you sure you want to remove '{album_name}' from your library?").format(album_name=item["name"])
         if gui.messageBox(msg, _("Confirm Remove Album"), wx.YES_NO | wx.ICON_WARNING) == wx.YES:
-            threading.Thread(target=self._remove_album_from_library_thread, args=(item['id'], item['name'])).start()
+            utils.submit(self._remove_album_from_library_thread, args=(item['id'], item['name']))
 
     def _remove_album_from_library_thread(self, album_id, album_name):
         result = self.client.remove_albums_from_library([album_id])
@@ -2214,7 +2249,7 @@ class ManagementDialog(AccessifyDialog):
         if not item: return
         msg = _("Are you sure you want to remove '{show_name}' from your library?").format(show_name=item["name"])
         if gui.messageBox(msg, _("Confirm Remove Show"), wx.YES_NO | wx.ICON_WARNING) == wx.YES:
-            threading.Thread(target=self._remove_show_from_library_thread, args=(item['id'], item['name'])).start()
+            utils.submit(self._remove_show_from_library_thread, args=(item['id'], item['name']))
 
     def _remove_show_from_library_thread(self, show_id, show_name):
         result = self.client.remove_shows_from_library([show_id])
@@ -2228,7 +2263,7 @@ class ManagementDialog(AccessifyDialog):
         if not artist: return
         msg = _("Are you sure you want to unfollow {artist_name}?").format(artist_name=artist['name'])
         if gui.messageBox(msg, _("Confirm Unfollow"), wx.YES_NO | wx.ICON_WARNING) == wx.YES:
-            threading.Thread(target=self._unfollow_artist_thread, args=(artist['id'], artist['name'])).start()
+            utils.submit(self._unfollow_artist_thread, args=(artist['id'], artist['name']))
 
     def _unfollow_artist_thread(self, artist_id, artist_name):
         result = self.client.unfollow_artists([artist_id])
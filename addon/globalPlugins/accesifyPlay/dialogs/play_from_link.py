@@ -1,7 +1,7 @@
 import wx
 import ui
-import threading
 from gui import guiHelper
+from .. import utils
 from .base import AccessifyDialog
 
 class PlayFromLinkDialog(AccessifyDialog):
@@ -52,7 +52,7 @@ class PlayFromLinkDialog(AccessifyDialog):
             return
         self.playButton.Disable()
         self.detailsText.SetValue(_("Checking..."))
-        threading.Thread(target=self._check_thread, args=(url,)).start()
+        utils.submit(self._check_thread, args=(url,))
 
     def _check_thread(self, url):
         details = self.client.get_link_details(url)
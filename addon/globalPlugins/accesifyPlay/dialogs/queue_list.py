@@ -1,6 +1,6 @@
 import wx
 import ui
-import threading
+from .. import utils
 from .base import AccessifyDialog
 
 class QueueListDialog(AccessifyDialog):
@@ -101,13 +101,14 @@ class QueueListDialog(AccessifyDialog):
             ui.message(_("Already playing the selected item."))
             return
         ui.message(_("Skipping to selected queue item..."))
-        threading.Thread(
-            target=self._skip_to_queue_item, args=(selection,)
-        ).start()
+        utils.submit(
+            self._skip_to_queue_item, args=(selection, item.get("uri")),
+            key=utils.PLAYBACK_TASK_KEY,
+        )
 
-    def _skip_to_queue_item(self, selection_index):
+    def _skip_to_queue_item(self, selection_index, uri=None):
         try:
-            message = self.client.skip_to_queue_index(selection_index)
+            message = self.client.skip_to_queue_index(selection_index, expected_uri=uri)
             if message:
                 wx.CallAfter(ui.message, message)
         finally:
@@ -127,7 +128,7 @@ class QueueListDialog(AccessifyDialog):
         self._announce_refresh_result = speak_status
         if speak_status:
             ui.message(_("Refreshing queue..."))
-        threading.Thread(target=self._refresh_thread).start()
+        utils.submit(self._refresh_thread)
 
     def _refresh_thread(self):
         try:
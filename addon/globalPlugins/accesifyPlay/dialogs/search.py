@@ -1,9 +1,10 @@
 # accesifyPlay/dialogs/search.py
 
-import threading
 import wx
 import ui
 import config
+from ..spotify_client import ALL_SEARCH_TYPES
+from .. import utils
 from .base import AccessifyDialog
 from .management import (
     ArtistDiscographyDialog,
@@ -18,6 +19,9 @@ class SearchDialog(AccessifyDialog):
     A dialog for searching Spotify and displaying results.
     Refactored with proactive playlist loading for context menus.
     """
+    # Delay after the last keystroke before a search-as-you-type request is sent.
+    SEARCH_DEBOUNCE_MS = 400
+    MIN_INCREMENTAL_QUERY_LENGTH = 2
     MENU_PLAY = wx.NewIdRef()
     MENU_ADD_QUEUE = wx.NewIdRef()
     MENU_FOLLOW = wx.NewIdRef()
@@ -36,6 +40,9 @@ class SearchDialog(AccessifyDialog):
         self.current_type = "track"
         self.next_offset = 0
         self.can_load_more = False
+        # Bumped for every new search; responses from older searches are dropped.
+        self._search_generation = 0
+        self._debounce_timer = None
         
         self._user_playlists = None
         self._playlists_loading = False
@@ -43,10 +50,11 @@ class SearchDialog(AccessifyDialog):
 
         self._init_ui()
         self._create_accelerators()
+        self.Bind(wx.EVT_WINDOW_DESTROY, self._on_destroy, self)
         self.queryText.SetFocus()
         
         # Memuat playlist di latar belakang saat dialog dibuka. Ini sudah benar.
-        threading.Thread(target=self._load_user_playlists).start()
+        utils.submit(self._load_user_playlists)
 
     def _init_ui(self):
         """Builds the user interface of the dialog."""
@@ -55,14 +63,17 @@ class SearchDialog(AccessifyDialog):
         controlsSizer = wx.BoxSizer(wx.HORIZONTAL)
         self.search_types = {
             _("Song"): "track", _("Album"): "album", _("Artist"): "artist",
-            _("Playlist"): "playlist", _("Podcast"): "show",
+            _("Playlist"): "playlist", _("Podcast"): "show", _("All"): "all",
+            _("My Library"): "library",
         }
         self.typeBox = wx.ComboBox(self, choices=list(self.search_types.keys()), style=wx.CB_READONLY)
         self.typeBox.SetValue(_("Song"))
+        self.typeBox.Bind(wx.EVT_COMBOBOX, self.onTypeChanged)
         controlsSizer.Add(self.typeBox, flag=wx.ALIGN_CENTER_VERTICAL)
 
         self.queryText = wx.TextCtrl(self, style=wx.TE_PROCESS_ENTER)
         self.queryText.Bind(wx.EVT_TEXT_ENTER, self.onSearch)
+        self.queryText.Bind(wx.EVT_TEXT, self.onQueryChanged)
         controlsSizer.Add(self.queryText, proportion=1, flag=wx.EXPAND | wx.LEFT, border=5)
 
         self.searchButton = wx.Button(self, label=_("&Search"))
@@ -106,16 +117,59 @@ class SearchDialog(AccessifyDialog):
         query = self.queryText.GetValue().strip()
         if not query:
             return
-            
+        self._cancel_debounce()
+        self.resultsList.Clear()
+        ui.message(_("Searching..."))
+        self._start_search(query)
+
+    def onQueryChanged(self, evt):
+        """Schedules a search-as-you-type request once typing pauses."""
+        evt.Skip()
+        if not config.conf["spotify"]["searchAsYouType"]:
+            return
+        self._cancel_debounce()
+        self._debounce_timer = wx.CallLater(self.SEARCH_DEBOUNCE_MS, self._on_typing_paused)
+
+    def _on_destroy(self, evt):
+        # Drop the pending keystroke timer and any responses still on their way.
+        self._cancel_debounce()
+        self._search_generation += 1
+        evt.Skip()
+
+    def _cancel_debounce(self):
+        if self._debounce_timer:
+            self._debounce_timer.Stop()
+            self._debounce_timer = None
+
+    def _on_typing_paused(self):
+        self._debounce_timer = None
+        query = self.queryText.GetValue().strip()
+        if len(query) < self.MIN_INCREMENTAL_QUERY_LENGTH:
+            return
+        search_type = self.search_types[self.typeBox.GetValue()]
+        if query == self.current_query and search_type == self.current_type:
+            return
+        # Keep focus in the query field while the results follow the typing.
+        self._start_search(query, move_focus=False)
+
+    def _start_search(self, query, move_focus=True):
+        self._search_generation += 1
         self.current_query = query
         self.current_type = self.search_types[self.typeBox.GetValue()]
         self.next_offset = 0
-        self._raw_results.clear()
-        self._rendered_items.clear()
-        self.resultsList.Clear()
-        
-        ui.message(_("Searching..."))
-        self.perform_search()
+        self.can_load_more = False
+        self.perform_search(move_focus=move_focus)
+
+    def onTypeChanged(self, evt=None):
+        """
+        Shows the current query's results for the newly chosen type.
+        After an "All" search these come from the search cache without a request.
+        """
+        search_type = self.search_types.get(self.typeBox.GetValue())
+        if search_type == "library":
+            utils.submit(self.client.prepare_library_search, background=True)
+        if self.current_query and search_type != self.current_type:
+            self._start_search(self.current_query, move_focus=False)
 
     def _on_item_activated(self):
         """Handles Enter key press or double-click on a list item."""
@@ -135,38 +189,93 @@ class SearchDialog(AccessifyDialog):
         if item and item.get("uri"):
             self._play_uri(item.get("uri"))
 
-    def perform_search(self):
+    def perform_search(self, move_focus=True):
         """Starts the background thread to fetch search results."""
         if not self.can_load_more and self.next_offset > 0:
             return 
             
-        index_to_focus = len(self._rendered_items)
-        threading.Thread(target=self._search_thread, args=(index_to_focus,)).start()
-
-    def _search_thread(self, index_to_focus):
+        index_to_focus = len(self._rendered_items) if self.next_offset else 0
+        request = (self._search_generation, self.current_query, self.current_type, self.next_offset)
+        # Only the newest search of this dialog is worth running; older ones are dropped.
+        # A library search may first have to sync the library, so it runs on the background pool.
+        is_library = self.current_type == "library"
+        utils.submit(
+            self._search_thread, args=(request, index_to_focus, move_focus),
+            key=("library_search" if is_library else "search", id(self)), latest_wins=True,
+            background=is_library,
+        )
+
+    def _search_thread(self, request, index_to_focus, move_focus):
         """Fetches data from the Spotify client in a background thread."""
-        result_data = self.client.search(self.current_query, self.current_type, offset=self.next_offset)
+        generation, query, search_type, offset = request
+        if generation != self._search_generation:
+            return  # Superseded before it was sent.
+
+        if search_type == "library":
+            results = self.client.search_library(query)
+            if isinstance(results, str):
+                wx.CallAfter(self._handle_search_error, generation, results)
+                return
+            wx.CallAfter(
+                self._apply_search_results, request, results, False, 0, index_to_focus, move_focus
+            )
+            return
+
+        result_data = self.client.search(query, search_type, offset=offset)
         
         if isinstance(result_data, str):
-            wx.CallAfter(ui.message, result_data)
+            wx.CallAfter(self._handle_search_error, generation, result_data)
             return
             
-        key = self.current_type + "s"
-        search_results = result_data.get(key, {})
-        new_items = search_results.get("items", [])
-        
-        self._raw_results.extend(new_items)
-        
-        if search_results.get("next"):
-            self.can_load_more = True
+        section_types = ALL_SEARCH_TYPES if search_type == "all" else (search_type,)
+        new_items = []
+        can_load_more = False
+        for section_type in section_types:
+            search_results = result_data.get(section_type + "s") or {}
+            new_items.extend(search_results.get("items") or [])
+            can_load_more = can_load_more or bool(search_results.get("next"))
+
+        next_offset = offset + len(new_items)
+        if can_load_more:
             limit = config.conf["spotify"]["searchLimit"]
-            self.next_offset = search_results.get("offset", 0) + limit
-        else:
-            self.can_load_more = False
+            next_offset = offset + limit
             
-        wx.CallAfter(self._update_results_list, index_to_focus)
+        wx.CallAfter(
+            self._apply_search_results, request, new_items, can_load_more, next_offset,
+            index_to_focus, move_focus,
+        )
+
+        if can_load_more and generation == self._search_generation:
+            # Fetch the next page now so "Load More" is answered from the cache. It runs as
+            # its own task so the next keystroke's search never waits behind it.
+            utils.submit(
+                self._prefetch_thread, args=(generation, query, search_type, next_offset),
+                key=("search_prefetch", id(self)), latest_wins=True, background=True,
+            )
+
+    def _prefetch_thread(self, generation, query, search_type, offset):
+        if generation == self._search_generation:
+            self.client.prefetch_search(query, search_type, offset)
+
+    def _handle_search_error(self, generation, message):
+        if generation == self._search_generation:
+            ui.message(message)
+
+    def _apply_search_results(
+        self, request, new_items, can_load_more, next_offset, focus_index, move_focus
+    ):
+        """Adds a page of results, unless a newer search or page got there first."""
+        generation, _query, _search_type, offset = request
+        if generation != self._search_generation or offset != self.next_offset:
+            return
+        if offset == 0:
+            self._raw_results = []
+        self._raw_results.extend(new_items)
+        self.can_load_more = can_load_more
+        self.next_offset = next_offset
+        self._update_results_list(focus_index, move_focus)
 
-    def _update_results_list(self, focus_index):
+    def _update_results_list(self, focus_index, move_focus=True):
         """Updates the ListBox with the latest results."""
         self.resultsList.Clear()
         self._rendered_items.clear()
@@ -187,12 +296,16 @@ class SearchDialog(AccessifyDialog):
         if self._rendered_items:
             self.resultsList.SetSelection(focus_index)
             self.resultsList.EnsureVisible(focus_index)
-            self.resultsList.SetFocus()
+            if move_focus:
+                self.resultsList.SetFocus()
             
     def _format_item_for_display(self, item):
         """Creates a readable string for an item to be shown in the ListBox."""
         display = item.get("name", "Unknown")
         item_type = item.get("type")
+        if self.current_type in ("all", "library"):
+            # Mixed result lists name the type first.
+            display = f"{self.client._get_type_label(item_type)}: {display}"
         
         if item_type == "track":
             artists = ", ".join([a["name"] for a in item.get("artists", [])])
@@ -216,10 +329,11 @@ class SearchDialog(AccessifyDialog):
             context_uri = album_info.get("uri")
             if context_uri and track_uri:
                 ui.message(_("Playing."))
-                threading.Thread(
-                    target=self.client.play_context_with_offset,
+                utils.submit(
+                    self.client.play_context_with_offset,
                     args=(context_uri, track_uri),
-                ).start()
+                    key=utils.PLAYBACK_TASK_KEY,
+                )
             else:
                 self._play_uri(track_uri)
             return
@@ -353,7 +467,7 @@ class SearchDialog(AccessifyDialog):
                 result = self.client.check_if_playlist_is_followed(item.get("id"), [self._current_user_id])
                 is_followed_status = result[0] if isinstance(result, list) and result else False
                 wx.CallAfter(show_menu, is_followed_status)
-            threading.Thread(target=_check_and_show).start()
+            utils.submit(_check_and_show)
         else:
             show_menu()
 
@@ -374,12 +488,12 @@ class SearchDialog(AccessifyDialog):
         ))
         
         def _add_thread():
-            result = self.client.add_track_to_playlist(playlist_id, track_uri)
+            result = self.client.add_track_to_playlist(playlist_id, track_uri, track=track)
             if isinstance(result, str):
                 wx.CallAfter(ui.message, result)
             else:
                 wx.CallAfter(ui.message, _("Track added successfully."))
-        threading.Thread(target=_add_thread).start()
+        utils.submit(_add_thread)
 
     def on_save_album(self, evt=None):
         item = self._get_item_at_index(self.resultsList.GetSelection())
@@ -419,7 +533,7 @@ class SearchDialog(AccessifyDialog):
                 wx.CallAfter(ui.message, result)
             else:
                 wx.CallAfter(ui.message, _("You are now following {artist_name}.").format(artist_name=item["name"]))
-        threading.Thread(target=_follow).start()
+        utils.submit(_follow)
 
     def on_view_discography(self, evt=None):
         item = self._get_item_at_index(self.resultsList.GetSelection())
@@ -446,7 +560,7 @@ class SearchDialog(AccessifyDialog):
                 wx.CallAfter(ui.message, result)
             else:
                 wx.CallAfter(ui.message, message)
-        threading.Thread(target=_thread_action).start()
+        utils.submit(_thread_action)
 
     def _get_item_at_index(self, index):
         """
@@ -1,7 +1,7 @@
 import wx
 import ui
-import threading
 from gui import guiHelper
+from .. import utils
 from .base import AccessifyDialog
 
 class SeekDialog(AccessifyDialog):
@@ -40,7 +40,7 @@ class SeekDialog(AccessifyDialog):
             return
         
         ui.message(_("Seeking..."))
-        threading.Thread(target=self._seek_thread, args=(time_str,)).start()
+        utils.submit(self._seek_thread, args=(time_str,), key=utils.PLAYBACK_TASK_KEY)
         self.Close()
 
     def _seek_thread(self, time_str):
@@ -2,10 +2,9 @@ import wx
 import webbrowser
 import config
 import ui
-import threading
 from gui import settingsDialogs, guiHelper, messageBox
 import gui
-from .. import spotify_client, donate, updater # Tanda .. berarti naik satu level folder
+from .. import spotify_client, donate, updater, utils # Tanda .. berarti naik satu level folder
 from .base import AccessifyDialog
 from ..language import AVAILABLE_LANGUAGE_CODES, LANGUAGE_AUTO, LANGUAGE_DISPLAY_OVERRIDES
 
@@ -121,6 +120,11 @@ class SpotifySettingsPanel(settingsDialogs.SettingsPanel):
             config.conf["spotify"]["announceTrackChanges"]
         )
 
+        self.searchAsYouType = sHelper.addItem(
+            wx.CheckBox(self, label=_("Search as you type"))
+        )
+        self.searchAsYouType.SetValue(config.conf["spotify"]["searchAsYouType"])
+
         # Updater settings
         self.updateChannelCtrl = sHelper.addLabeledControl(
             _("Update Channel:"),
@@ -270,6 +274,7 @@ class SpotifySettingsPanel(settingsDialogs.SettingsPanel):
         config.conf["spotify"][
             "announceTrackChanges"
         ] = self.announceTrackChanges.IsChecked()
+        config.conf["spotify"]["searchAsYouType"] = self.searchAsYouType.IsChecked()
         config.conf["spotify"]["updateChannel"] = (
             "beta" if self.updateChannelCtrl.GetValue() == _("Beta") else "stable"
         )
@@ -280,7 +285,7 @@ class SpotifySettingsPanel(settingsDialogs.SettingsPanel):
     def onValidate(self, evt):
         self.onSave()  # Save current UI values to config.conf before validating
         ui.message(_("Validating credentials with Spotify..."))
-        threading.Thread(target=self.run_validation).start()
+        utils.submit(self.run_validation)
 
     def run_validation(self):
         success = self.client.validate()  # Validate without explicit parameters
@@ -302,7 +307,7 @@ class SpotifySettingsPanel(settingsDialogs.SettingsPanel):
 
         if result == wx.YES:
             ui.message(_("Clearing credentials and cache..."))
-            threading.Thread(target=self._clear_credentials_thread).start()
+            utils.submit(self._clear_credentials_thread)
 
     def _clear_credentials_thread(self):
         message = self.client.clear_credentials_and_cache()
@@ -1,6 +1,5 @@
 import wx
 import ui
-import threading
 from gui import guiHelper
 from .base import AccessifyDialog
 
@@ -15,7 +14,8 @@ class SetVolumeDialog(AccessifyDialog):
         label = _("Volume (0-100):")
         self.volumeCtrl = sHelper.addLabeledControl(label, wx.SpinCtrl)
         self.volumeCtrl.SetRange(0, 100)
-        self.volumeCtrl.SetValue(50)  # Default value
+        known_volume = client.get_known_volume()
+        self.volumeCtrl.SetValue(50 if known_volume is None else known_volume)
 
         # Action buttons
         buttonsSizer = wx.StdDialogButtonSizer()
@@ -34,14 +34,14 @@ class SetVolumeDialog(AccessifyDialog):
         self.volumeCtrl.SetFocus()
 
     def onSet(self, evt):
-        volume = self.volumeCtrl.GetValue()
-        ui.message(_("Setting volume to {volume}%...").format(volume=volume))
-        threading.Thread(target=self._set_volume_thread, args=(volume,)).start()
+        # The volume is sent in the background, the same way as the volume keys.
+        result = self.client.set_volume(self.volumeCtrl.GetValue(), on_error=self._report_error)
+        if isinstance(result, str):
+            ui.message(result)
+        else:
+            ui.message(_("Volume set to {volume}%").format(volume=result))
         self.Close()
 
-    def _set_volume_thread(self, volume):
-        result = self.client._execute(self.client.client.volume, volume)
-        if isinstance(result, str):  # Error message
-            wx.CallAfter(ui.message, result)
-        else:
-            wx.CallAfter(ui.message, _("Volume set to {volume}%").format(volume=volume))
+    @staticmethod
+    def _report_error(message):
+        wx.CallAfter(ui.message, message)
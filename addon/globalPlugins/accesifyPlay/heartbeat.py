@@ -0,0 +1,103 @@
+# heartbeat.py
+
+import threading
+import time
+
+from logHandler import log
+
+# A job that raises is tried again after this many seconds.
+JOB_ERROR_RETRY = 60.0
+# How long stop() waits for a running job to finish.
+STOP_TIMEOUT = 2.0
+
+
+class Heartbeat:
+    """
+    Runs the add-on's periodic background jobs on a single thread.
+    A job is a callable returning the number of seconds until it should run again,
+    or None to remove itself. Jobs run one at a time, in order of their due time.
+    """
+
+    def __init__(self):
+        self._jobs = {}  # name -> [due_time, func]
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._running = False
+        self._thread = None
+
+    def add_job(self, name, func, delay=0.0):
+        """Adds a job, or replaces the job already registered under that name."""
+        with self._lock:
+            self._jobs[name] = [time.monotonic() + delay, func]
+        self._wakeup.set()
+
+    def remove_job(self, name):
+        with self._lock:
+            self._jobs.pop(name, None)
+
+    def run_soon(self, name, delay=0.0):
+        """Brings a job forward so it runs within `delay` seconds."""
+        with self._lock:
+            job = self._jobs.get(name)
+            if not job:
+                return
+            job[0] = min(job[0], time.monotonic() + delay)
+        self._wakeup.set()
+
+    def start(self):
+        with self._lock:
+            self._running = True
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="AccessifyHeartbeat")
+            self._thread.daemon = True
+            self._thread.start()
+
+    def stop(self):
+        """Stops the thread, waiting briefly for a job that is still running."""
+        with self._lock:
+            self._running = False
+            thread = self._thread
+            self._thread = None
+        self._wakeup.set()
+        if thread and thread is not threading.current_thread():
+            thread.join(STOP_TIMEOUT)
+
+    def _run(self):
+        while self._running:
+            with self._lock:
+                now = time.monotonic()
+                due = [(job[0], name) for name, job in self._jobs.items()]
+            if not due:
+                wait = None
+            else:
+                wait = max(0.0, min(due)[0] - now)
+            if wait is None or wait > 0:
+                self._wakeup.wait(wait)
+                self._wakeup.clear()
+                continue
+            if not self._running:
+                break
+            self._run_due_job(min(due)[1])
+
+    def _run_due_job(self, name):
+        with self._lock:
+            job = self._jobs.get(name)
+            if not job or job[0] > time.monotonic():
+                return
+            func = job[1]
+            # Push the job back while it runs so run_soon() calls made meanwhile still count.
+            job[0] = float("inf")
+        try:
+            delay = func()
+        except Exception:
+            log.error(f"Spotify: Background job '{name}' failed.", exc_info=True)
+            delay = JOB_ERROR_RETRY
+        with self._lock:
+            job = self._jobs.get(name)
+            if not job or job[1] is not func:
+                return  # Removed or replaced while running.
+            if delay is None:
+                del self._jobs[name]
+            else:
+                job[0] = min(job[0], time.monotonic() + delay)
@@ -0,0 +1,117 @@
+# library_index.py
+
+import heapq
+import re
+import unicodedata
+from bisect import bisect_left
+
+_TOKEN_SPLIT = re.compile(r"[^\w]+", re.UNICODE)
+
+# Results are ordered by type when their match quality is the same.
+_TYPE_ORDER = {"track": 0, "artist": 1, "album": 2, "playlist": 3, "show": 4}
+
+
+def normalize(text):
+    """Lowercases text and strips accents so "Beyoncé" matches "beyonce"."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+
+def tokenize(text):
+    return [token for token in _TOKEN_SPLIT.split(normalize(text)) if token]
+
+
+class LibraryIndex:
+    """
+    An in-memory inverted index over the names in the user's library.
+    Tracks are indexed by their own name plus their artists and album, so searching
+    for an artist also finds their saved songs. Every query word matches as a prefix
+    of a word in the item, and all query words must match.
+    """
+
+    def __init__(self, items):
+        self._items = []
+        self._name_tokens = []
+        self._all_tokens = []
+        postings = {}
+        seen_uris = set()
+        for item in items:
+            if not isinstance(item, dict) or not item.get("name"):
+                continue
+            uri = item.get("uri")
+            if uri:
+                if uri in seen_uris:
+                    continue
+                seen_uris.add(uri)
+            doc_id = len(self._items)
+            name_tokens = set(tokenize(item.get("name")))
+            other_tokens = set()
+            for artist in item.get("artists") or []:
+                other_tokens.update(tokenize((artist or {}).get("name")))
+            if item.get("type") == "track":
+                other_tokens.update(tokenize((item.get("album") or {}).get("name")))
+            elif item.get("type") == "playlist":
+                other_tokens.update(tokenize((item.get("owner") or {}).get("display_name")))
+            elif item.get("type") == "show":
+                other_tokens.update(tokenize(item.get("publisher")))
+            all_tokens = name_tokens | other_tokens
+            self._items.append(item)
+            self._name_tokens.append(name_tokens)
+            self._all_tokens.append(all_tokens)
+            for token in all_tokens:
+                postings.setdefault(token, set()).add(doc_id)
+        self._postings = postings
+        self._sorted_tokens = sorted(postings)
+
+    def __len__(self):
+        return len(self._items)
+
+    def _tokens_with_prefix(self, prefix):
+        start = bisect_left(self._sorted_tokens, prefix)
+        end = start
+        while end < len(self._sorted_tokens) and self._sorted_tokens[end].startswith(prefix):
+            end += 1
+        return self._sorted_tokens[start:end]
+
+    def search(self, query, limit=None):
+        """Returns the library items matching every word of the query, best matches first."""
+        query_tokens = tokenize(query)
+        if not query_tokens:
+            return []
+
+        # Start from the query word with the fewest matching index words, then filter.
+        expansions = sorted(
+            ((token, self._tokens_with_prefix(token)) for token in query_tokens),
+            key=lambda pair: len(pair[1]),
+        )
+        first_matches = expansions[0][1]
+        if not first_matches:
+            return []
+        candidates = set()
+        for token in first_matches:
+            candidates.update(self._postings[token])
+
+        for query_token, matches in expansions[1:]:
+            if not matches:
+                return []
+            candidates = {
+                doc_id for doc_id in candidates
+                if any(token.startswith(query_token) for token in self._all_tokens[doc_id])
+            }
+            if not candidates:
+                return []
+
+        def rank(doc_id):
+            name_tokens = self._name_tokens[doc_id]
+            exact = sum(1 for token in query_tokens if token in self._all_tokens[doc_id])
+            in_name = sum(
+                1 for token in query_tokens
+                if any(name_token.startswith(token) for name_token in name_tokens)
+            )
+            item_type = self._items[doc_id].get("type")
+            return (-in_name, -exact, _TYPE_ORDER.get(item_type, len(_TYPE_ORDER)), doc_id)
+
+        if limit is not None and limit < len(candidates):
+            ordered = heapq.nsmallest(limit, candidates, key=rank)
+        else:
+            ordered = sorted(candidates, key=rank)
+        return [self._items[doc_id] for doc_id in ordered]
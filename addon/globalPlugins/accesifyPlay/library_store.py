@@ -0,0 +1,167 @@
+# library_store.py
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import globalVars
+from logHandler import log
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS collections (
+    name TEXT PRIMARY KEY,
+    synced_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS items (
+    collection TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    item_id TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (collection, position)
+);
+"""
+
+
+def _get_store_path():
+    """Returns the path to the library database, in NVDA's user configuration directory."""
+    return os.path.join(globalVars.appArgs.configPath, "accessifyPlay_library.sqlite3")
+
+def item_id(item):
+    """Returns the Spotify ID of a stored item, unwrapping saved-item objects."""
+    if not isinstance(item, dict):
+        return None
+    for key in ("track", "album", "show"):
+        if isinstance(item.get(key), dict):
+            return item[key].get("id")
+    return item.get("id")
+
+
+class LibraryStore:
+    """
+    Keeps the user's library collections on disk between sessions.
+    Each collection is stored in the order the Web API returned it (newest first
+    for saved items). Database errors are logged and reported as a missing
+    collection, so callers can always fall back to the network.
+    """
+
+    def __init__(self, path=None):
+        self._path = path or _get_store_path()
+        self._lock = threading.Lock()
+        self._schema_ready = False
+
+    def _connect(self):
+        connection = sqlite3.connect(self._path, timeout=10)
+        if not self._schema_ready:
+            connection.executescript(SCHEMA)
+            self._schema_ready = True
+        return connection
+
+    def get_owner(self):
+        """Returns the ID of the Spotify user the stored library belongs to."""
+        with self._lock:
+            try:
+                connection = self._connect()
+                try:
+                    row = connection.execute(
+                        "SELECT value FROM meta WHERE key = 'owner'"
+                    ).fetchone()
+                finally:
+                    connection.close()
+            except sqlite3.Error as e:
+                log.error(f"Spotify: Could not read the library store: {e}", exc_info=True)
+                return None
+        return row[0] if row else None
+
+    def set_owner(self, user_id):
+        """Empties the store and assigns it to another Spotify user."""
+        with self._lock:
+            try:
+                connection = self._connect()
+                try:
+                    with connection:
+                        connection.execute("DELETE FROM items")
+                        connection.execute("DELETE FROM collections")
+                        connection.execute(
+                            "INSERT OR REPLACE INTO meta (key, value) VALUES ('owner', ?)",
+                            (user_id,),
+                        )
+                finally:
+                    connection.close()
+            except sqlite3.Error as e:
+                log.error(f"Spotify: Could not reset the library store: {e}", exc_info=True)
+
+    def load(self, collection):
+        """Returns the stored items of a collection, or None if it was never synced."""
+        with self._lock:
+            try:
+                connection = self._connect()
+                try:
+                    synced = connection.execute(
+                        "SELECT 1 FROM collections WHERE name = ?", (collection,)
+                    ).fetchone()
+                    if not synced:
+                        return None
+                    rows = connection.execute(
+                        "SELECT data FROM items WHERE collection = ? ORDER BY position",
+                        (collection,),
+                    ).fetchall()
+                finally:
+                    connection.close()
+                return [json.loads(row[0]) for row in rows]
+            except (sqlite3.Error, ValueError) as e:
+                log.error(f"Spotify: Could not load '{collection}' from the library store: {e}", exc_info=True)
+                return None
+
+    def replace(self, collection, items):
+        """Stores items as the new contents of a collection."""
+        rows = [
+            (collection, position, item_id(item), json.dumps(item))
+            for position, item in enumerate(items)
+        ]
+        with self._lock:
+            try:
+                connection = self._connect()
+                try:
+                    with connection:
+                        connection.execute("DELETE FROM items WHERE collection = ?", (collection,))
+                        connection.executemany(
+                            "INSERT INTO items (collection, position, item_id, data) VALUES (?, ?, ?, ?)",
+                            rows,
+                        )
+                        connection.execute(
+                            "INSERT OR REPLACE INTO collections (name, synced_at) VALUES (?, ?)",
+                            (collection, time.time()),
+                        )
+                finally:
+                    connection.close()
+            except sqlite3.Error as e:
+                log.error(f"Spotify: Could not save '{collection}' to the library store: {e}", exc_info=True)
+
+    def remove(self, collection, item_ids):
+        """Drops items from a stored collection, keeping the order of the rest."""
+        items = self.load(collection)
+        if items is None:
+            return
+        removed = set(item_ids)
+        self.replace(collection, [item for item in items if item_id(item) not in removed])
+
+    def clear(self):
+        """Deletes everything in the store."""
+        with self._lock:
+            try:
+                connection = self._connect()
+                try:
+                    with connection:
+                        connection.execute("DELETE FROM items")
+                        connection.execute("DELETE FROM collections")
+                        connection.execute("DELETE FROM meta")
+                finally:
+                    connection.close()
+            except sqlite3.Error as e:
+                log.error(f"Spotify: Could not clear the library store: {e}", exc_info=True)
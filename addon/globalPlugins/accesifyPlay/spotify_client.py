@@ -1,20 +1,109 @@
 # spotify_client.py
 
+import copy
 import os
+import random
 import webbrowser
 from urllib.parse import urlparse
 import time
 import spotipy
 from spotipy.oauth2 import SpotifyPKCE, CacheFileHandler
 from spotipy.exceptions import SpotifyException
+from spotipy.util import Retry
 import config
 from logHandler import log
 import json
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 import requests
 
+from . import heartbeat, library_index, library_store, utils
+
 # This will be the single, shared instance of the client
 _instance = None
 
+# How long (in seconds) a fetched playback state is reused before hitting the API again.
+PLAYBACK_CACHE_TTL = 2.0
+# How long (in seconds) a resolved device ID is trusted without asking Spotify again.
+DEVICE_CACHE_TTL = 300.0
+# The access token is refreshed in the background this many seconds before it expires,
+# plus a random jitter so several NVDA instances don't refresh in lockstep.
+TOKEN_REFRESH_MARGIN = 300
+TOKEN_REFRESH_JITTER = 60
+# Maximum number of album IDs accepted by the several-albums endpoint.
+ALBUMS_BATCH_SIZE = 20
+# Backoff bounds (in seconds) after a failed background refresh.
+TOKEN_REFRESH_RETRY_MIN = 15
+TOKEN_REFRESH_RETRY_MAX = 600
+# How often (in seconds) saved collections are synced in the background once the library is in use.
+LIBRARY_REFRESH_INTERVAL = 1800.0
+# Token bucket shared by every Web API request: sustained requests per second and burst size.
+RATE_LIMIT_RATE = 8.0
+RATE_LIMIT_BURST = 20
+# Tokens background requests must leave untouched so keypresses never wait on a refill.
+RATE_LIMIT_BACKGROUND_RESERVE = 5
+# Interactive requests give up instead of waiting longer than this (in seconds) for a Retry-After.
+RATE_LIMIT_INTERACTIVE_MAX_WAIT = 5.0
+# Used when Spotify answers 429 without a usable Retry-After header.
+RATE_LIMIT_DEFAULT_RETRY_AFTER = 5.0
+RATE_LIMIT_MAX_RETRIES = 2
+# Server errors still retried by the HTTP adapter; 429 is handled by the scheduler instead.
+HTTP_RETRY_STATUS_CODES = (500, 502, 503, 504)
+# How long (in seconds) the local library search index is used before syncing the library again.
+LIBRARY_INDEX_TTL = 300.0
+# Maximum number of results returned by a library search.
+LIBRARY_SEARCH_LIMIT = 500
+# Number of search result pages kept in memory, and how long (in seconds) each is reused.
+SEARCH_CACHE_SIZE = 100
+SEARCH_CACHE_TTL = 600.0
+# Minimum time (in seconds) between progress reports of a bulk queue operation.
+QUEUE_PROGRESS_INTERVAL = 3.0
+# Queue jumps at least this far restart playback from the target instead of skipping
+# track by track; closer targets are cheaper to reach with next-track commands.
+QUEUE_JUMP_MIN_DISTANCE = 3
+# Volume presses only move a local target; the newest value is sent once presses pause
+# for VOLUME_SEND_DELAY seconds, and checked against Spotify VOLUME_RECONCILE_DELAY later.
+VOLUME_SEND_DELAY = 0.3
+VOLUME_RECONCILE_DELAY = 2.0
+# The playback position is extrapolated locally from a snapshot up to this many seconds old.
+POSITION_MODEL_MAX_AGE = 60.0
+# Seek presses add up locally and are sent once they pause for this many seconds.
+SEEK_SEND_DELAY = 0.3
+# Play/pause, shuffle and repeat toggles start from a cached snapshot up to this many
+# seconds old. The result is announced at once and sent after TOGGLE_SEND_DELAY, so quick
+# repeated presses collapse into one command. Spotify's state is checked TOGGLE_RECONCILE_DELAY later.
+TOGGLE_STATE_MAX_AGE = 30.0
+TOGGLE_SEND_DELAY = 0.1
+TOGGLE_RECONCILE_DELAY = 2.0
+# The queue is fetched in the background this many seconds after the playing item or the
+# queue changes, and the copy is used to predict the next item for up to QUEUE_SNAPSHOT_MAX_AGE.
+QUEUE_PREFETCH_DELAY = 1.0
+QUEUE_SNAPSHOT_MAX_AGE = 300.0
+# Pauses (in seconds) between checks for the new item after skipping a track.
+TRACK_CHANGE_POLL_DELAYS = (0.15, 0.25, 0.4, 0.6, 1.0)
+# Catalog types requested together by an "all" search.
+ALL_SEARCH_TYPES = ("track", "album", "artist", "playlist", "show")
+# Number of playlists whose full track list is kept in memory.
+PLAYLIST_CACHE_SIZE = 30
+# Read-only calls whose concurrent identical requests share a single HTTP round trip.
+COALESCED_COMMANDS = frozenset({
+    "current_playback",
+    "currently_playing",
+    "queue",
+    "devices",
+    "current_user",
+    "current_user_playlists",
+    "current_user_saved_tracks",
+    "current_user_saved_albums",
+    "current_user_saved_shows",
+    "current_user_followed_artists",
+    "current_user_recently_played",
+    "search",
+})
+# Seconds a caller waits for a joined call before sending its own request.
+COALESCED_WAIT_TIMEOUT = 15.0
+
 
 def _get_cache_path():
     """Returns the path to the Spotify token cache file, in the user's %USERPROFILE% directory."""
@@ -52,6 +141,253 @@ def _clear_client_id_file():
     else:
         log.info(f"Spotify: Client ID file not found at {path}, no deletion needed.")
 
+class _MemoryCacheFileHandler(CacheFileHandler):
+    """
+    A CacheFileHandler that keeps the token in memory.
+    The file is read once on first use and written only when a new token is saved.
+    """
+
+    def __init__(self, cache_path):
+        super().__init__(cache_path=cache_path)
+        self._token_info = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def get_cached_token(self):
+        with self._lock:
+            if not self._loaded:
+                self._token_info = super().get_cached_token()
+                self._loaded = True
+            return dict(self._token_info) if self._token_info else None
+
+    def save_token_to_cache(self, token_info):
+        with self._lock:
+            self._token_info = dict(token_info) if token_info else None
+            self._loaded = True
+            super().save_token_to_cache(token_info)
+
+    def clear(self):
+        """Forgets the in-memory token so the next read goes back to disk."""
+        with self._lock:
+            self._token_info = None
+            self._loaded = False
+
+class _SingleFlightSpotifyPKCE(SpotifyPKCE):
+    """
+    A SpotifyPKCE manager whose token refreshes are single-flight.
+    When several threads find the token expired at once, one of them refreshes it
+    and the others reuse that result instead of sending their own request.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._refresh_lock = threading.Lock()
+        self._refresh_generation = 0
+        self._last_refreshed_token = None
+
+    def refresh_access_token(self, refresh_token):
+        generation = self._refresh_generation
+        with self._refresh_lock:
+            if self._refresh_generation != generation and self._last_refreshed_token:
+                # A refresh finished while we were waiting for the lock.
+                return dict(self._last_refreshed_token)
+            cached = self.cache_handler.get_cached_token()
+            if (
+                cached
+                and cached.get("refresh_token")
+                and cached["refresh_token"] != refresh_token
+                and not self.is_token_expired(cached)
+            ):
+                # The refresh token we were given has already been rotated by another refresh.
+                return cached
+            token_info = super().refresh_access_token(refresh_token)
+            self._last_refreshed_token = dict(token_info) if token_info else None
+            self._refresh_generation += 1
+            return token_info
+
+class _RequestScheduler:
+    """
+    Paces every Web API request sent by the add-on.
+    All requests share one token bucket and wait out any Retry-After sent by Spotify.
+    Requests run in the interactive lane unless the calling thread is inside lane(BACKGROUND);
+    background requests yield to waiting interactive ones and leave a reserve of tokens.
+    """
+
+    INTERACTIVE = "interactive"
+    BACKGROUND = "background"
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._tokens = float(RATE_LIMIT_BURST)
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._interactive_waiting = 0
+        self._local = threading.local()
+        self.last_success_time = 0.0
+
+    def current_lane(self):
+        return getattr(self._local, "lane", self.INTERACTIVE)
+
+    @contextmanager
+    def lane(self, lane):
+        """Runs the requests made by the current thread in the given lane."""
+        previous = self.current_lane()
+        self._local.lane = lane
+        try:
+            yield
+        finally:
+            self._local.lane = previous
+
+    def blocked_for(self):
+        """Seconds left before Spotify accepts requests again, or 0."""
+        return max(0.0, self._blocked_until - time.monotonic())
+
+    def acquire(self):
+        """
+        Waits until the current thread may send a request.
+        Returns False if an interactive request would have to wait too long.
+        """
+        interactive = self.current_lane() == self.INTERACTIVE
+        deadline = time.monotonic() + RATE_LIMIT_INTERACTIVE_MAX_WAIT if interactive else None
+        reserve = 1 if interactive else 1 + RATE_LIMIT_BACKGROUND_RESERVE
+        with self._condition:
+            if interactive:
+                self._interactive_waiting += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._tokens = min(
+                        RATE_LIMIT_BURST,
+                        self._tokens + (now - self._updated_at) * RATE_LIMIT_RATE,
+                    )
+                    self._updated_at = now
+                    if now < self._blocked_until:
+                        wait = self._blocked_until - now
+                    elif not interactive and self._interactive_waiting:
+                        wait = 1.0  # Woken up early once the interactive requests are through.
+                    elif self._tokens >= reserve:
+                        self._tokens -= 1
+                        return True
+                    else:
+                        wait = (reserve - self._tokens) / RATE_LIMIT_RATE
+                    if deadline is not None and now + wait > deadline:
+                        return False
+                    self._condition.wait(wait)
+            finally:
+                if interactive:
+                    self._interactive_waiting -= 1
+                    self._condition.notify_all()
+
+    def penalize(self, headers):
+        """Blocks every lane for the Retry-After period of a 429 response."""
+        try:
+            retry_after = float((headers or {}).get("Retry-After"))
+        except (TypeError, ValueError):
+            retry_after = RATE_LIMIT_DEFAULT_RETRY_AFTER
+        with self._condition:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+            self._tokens = 0.0
+            self._condition.notify_all()
+        log.warning(f"Spotify: Rate limited, pausing requests for {retry_after:.0f} seconds.")
+
+class _InFlightCall:
+    """A Web API call that other threads can wait on instead of repeating it."""
+
+    def __init__(self, lane=None, ensure_device=False):
+        self.done = threading.Event()
+        self.result = None
+        self.lane = lane
+        self.ensure_device = ensure_device
+
+class _DelayedCall:
+    """
+    Runs a function on its own timer thread once a delay passes without another schedule(),
+    so keypress debouncing never waits behind the heartbeat's periodic jobs.
+    Runs never overlap, so each one sees the state left by the one before.
+    """
+
+    def __init__(self, name, func):
+        self._name = name
+        self._func = func
+        self._lock = threading.Lock()
+        self._run_lock = threading.Lock()
+        self._timer = None
+
+    def schedule(self, delay):
+        """(Re)starts the delay, replacing a run that has not started yet."""
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+            self._timer = threading.Timer(delay, self._run)
+            self._timer.name = f"Accessify{self._name}"
+            self._timer.daemon = True
+            self._timer.start()
+
+    def cancel(self):
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+
+    def _run(self):
+        with self._run_lock:
+            try:
+                self._func()
+            except Exception:
+                log.error(f"Spotify: Delayed call '{self._name}' failed.", exc_info=True)
+
+class _ScheduledSpotify(spotipy.Spotify):
+    """A Spotify client whose HTTP requests all go through a _RequestScheduler."""
+
+    def __init__(self, scheduler, **kwargs):
+        super().__init__(status_forcelist=HTTP_RETRY_STATUS_CODES, **kwargs)
+        self._scheduler = scheduler
+
+    def _build_session(self):
+        """
+        Builds spotipy's session without urllib3's own Retry-After handling, which would
+        otherwise sleep through 429 responses and bypass the scheduler.
+        """
+        self._session = requests.Session()
+        retry = Retry(
+            total=self.retries,
+            connect=None,
+            read=False,
+            allowed_methods=frozenset(["GET", "POST", "PUT", "DELETE"]),
+            status=self.status_retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=self.status_forcelist,
+            respect_retry_after_header=False,
+        )
+        adapter = requests.adapters.HTTPAdapter(max_retries=retry)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    def _internal_call(self, method, url, payload, params):
+        attempts = 0
+        while True:
+            if not self._scheduler.acquire():
+                raise SpotifyException(
+                    429,
+                    -1,
+                    f"{url}:\n Rate limited",
+                    headers={"Retry-After": str(int(self._scheduler.blocked_for()) + 1)},
+                )
+            try:
+                # The parent pops content_type from params, so give each attempt its own copy.
+                result = super()._internal_call(method, url, payload, dict(params or {}))
+                self._scheduler.last_success_time = time.monotonic()
+                return result
+            except SpotifyException as e:
+                if e.http_status == 429 and not e.headers:
+                    # spotipy reports retries exhausted on 5xx responses as a 429 without
+                    # headers; pass it on as the server failure it is, not a rate limit.
+                    raise SpotifyException(503, e.code, e.msg, reason=e.reason) from e
+                if e.http_status != 429 or attempts >= RATE_LIMIT_MAX_RETRIES:
+                    raise
+                attempts += 1
+                self._scheduler.penalize(e.headers)
+
 def get_client():
     """Returns the shared instance of the SpotifyClient."""
     global _instance
@@ -64,10 +400,52 @@ class SpotifyClient:
     def __init__(self):
         self.client = None
         self.device_id = None
+        self._cache_handler = None
+        self._device_resolved_at = 0.0
+        self._playback_cache = None
+        self._playback_cache_time = 0.0
+        self._playback_generation = 0  # Bumped whenever the cached snapshot is replaced or dropped.
+        self._playback_fetch = None  # _InFlightCall of the newest playback fetch still running
+        self._playback_lock = threading.Lock()
+        self._position_anchor = None
+        self._seek_lock = threading.Lock()
+        self._seek_request = None
+        self._toggle_lock = threading.Lock()
+        self._last_item_uri = None
+        self._queue_snapshot = None  # (queue data, monotonic time it was fetched)
+        self._pending_toggles = {}  # setting -> (new value, value before the first press, on_message)
+        self._sent_toggles = {}  # setting -> (value sent, on_message)
+        self._token_refresh_failures = 0
+        self._token_refresh_at = None  # (expires_at of the token, time it is refreshed)
+        self.heartbeat = heartbeat.Heartbeat()
+        self._scheduler = _RequestScheduler()
+        self._inflight_calls = {}
+        self._inflight_lock = threading.Lock()
+        self._playlist_cache = OrderedDict()
+        self._playlist_cache_lock = threading.Lock()
+        self._search_cache = OrderedDict()
+        self._search_cache_lock = threading.Lock()
+        self._playback_command_listeners = []
+        self._library_store = None
+        self._library_store_lock = threading.Lock()
+        self._current_user_id = None
+        self._library_index = None
+        self._library_index_time = 0.0
+        self._library_index_lock = threading.Lock()
+        self._volume_lock = threading.Lock()
+        self._volume_target = None
+        self._volume_sent = None
+        self._volume_error_callback = None
+        self._volume_send = _DelayedCall("VolumeSend", self._send_volume_job)
+        self._volume_reconcile = _DelayedCall("VolumeReconcile", self._reconcile_volume_job)
+        self._seek_send = _DelayedCall("SeekSend", self._send_seek_job)
+        self._toggle_send = _DelayedCall("ToggleSend", self._send_toggles_job)
+        self._toggle_reconcile = _DelayedCall("ToggleReconcile", self._reconcile_toggles_job)
 
     def _get_cache_handler(self):
-        """Creates a CacheFileHandler pointing to the user's %USERPROFILE% directory."""
-        return CacheFileHandler(cache_path=_get_cache_path())
+        """Creates an in-memory token cache backed by the file in the user's %USERPROFILE% directory."""
+        self._cache_handler = _MemoryCacheFileHandler(cache_path=_get_cache_path())
+        return self._cache_handler
 
     def _get_auth_manager(self, open_browser=False):
         """Creates a SpotifyPKCE manager."""
@@ -78,7 +456,7 @@ class SpotifyClient:
         port = config.conf["spotify"]["port"]
         redirect_uri = f"http://127.0.0.1:{port}/callback"
 
-        return SpotifyPKCE(
+        return _SingleFlightSpotifyPKCE(
             client_id=clientID,
             redirect_uri=redirect_uri,
             scope="user-read-playback-state user-modify-playback-state user-read-currently-playing user-library-modify user-library-read playlist-read-private playlist-read-collaborative playlist-modify-public playlist-modify-private user-top-read user-read-recently-played user-follow-read user-follow-modify",
@@ -97,7 +475,11 @@ class SpotifyClient:
         try:
             token_info = auth_manager.get_access_token(check_cache=True)
             if token_info:
-                self.client = spotipy.Spotify(auth_manager=auth_manager, requests_timeout=10)
+                self.client = _ScheduledSpotify(
+                    self._scheduler, auth_manager=auth_manager, requests_timeout=10
+                )
+                self._current_user_id = None
+                self._start_background_jobs()
                 log.info(_("Spotify: Client successfully initialized from cache."))
             else:
                 self.client = None
@@ -119,8 +501,12 @@ class SpotifyClient:
         try:
             token_info = auth_manager.get_access_token(check_cache=False)
             if token_info:
-                self.client = spotipy.Spotify(auth_manager=auth_manager, requests_timeout=10)
+                self.client = _ScheduledSpotify(
+                    self._scheduler, auth_manager=auth_manager, requests_timeout=10
+                )
+                self._current_user_id = None
                 self.client.current_user()  # Test call
+                self._start_background_jobs()
                 log.info(_("Spotify: Validation successful."))
                 return True
             else:
@@ -136,6 +522,108 @@ class SpotifyClient:
             )
             return False
 
+    def shutdown(self):
+        """Stops background work owned by the client."""
+        self.heartbeat.stop()
+        for delayed_call in (
+            self._volume_send,
+            self._volume_reconcile,
+            self._seek_send,
+            self._toggle_send,
+            self._toggle_reconcile,
+        ):
+            delayed_call.cancel()
+
+    def background_requests(self):
+        """
+        Context manager that sends the current thread's requests in the background lane.
+        Use it for polling, keep-alive and prefetching so they never delay a keypress.
+        """
+        return self._scheduler.lane(_RequestScheduler.BACKGROUND)
+
+    def _rate_limited_message(self):
+        seconds = int(self._scheduler.blocked_for()) + 1
+        return _(
+            "Spotify is limiting requests right now. Please try again in {seconds} seconds."
+        ).format(seconds=seconds)
+
+    def seconds_since_last_response(self):
+        """Seconds since any Web API request last succeeded, or None if none has yet."""
+        last_success = self._scheduler.last_success_time
+        return time.monotonic() - last_success if last_success else None
+
+    def _start_background_jobs(self):
+        """Schedules the token refresh and library sync jobs on the heartbeat thread."""
+        self._token_refresh_failures = 0
+        self.heartbeat.add_job(
+            "token_refresh", self._token_refresh_job, delay=self._next_token_refresh_delay(0)
+        )
+        self.heartbeat.add_job(
+            "library_refresh", self._library_refresh_job, delay=LIBRARY_REFRESH_INTERVAL
+        )
+        self.heartbeat.start()
+
+    def _token_refresh_job(self):
+        if self._refresh_token_if_due():
+            self._token_refresh_failures = 0
+        else:
+            self._token_refresh_failures += 1
+        return self._next_token_refresh_delay(self._token_refresh_failures)
+
+    def _library_refresh_job(self):
+        """Keeps the stored library current, but only once the user has opened it."""
+        if self.client and self._library_store and self._current_user_id:
+            with self.background_requests():
+                for loader in (self.get_saved_tracks, self.get_saved_albums, self.get_saved_shows):
+                    result = loader()
+                    if isinstance(result, str):
+                        log.debug(f"Spotify: Background library sync stopped: {result}")
+                        break
+            self.invalidate_library_index()
+        return LIBRARY_REFRESH_INTERVAL
+
+    def _next_token_refresh_delay(self, failures):
+        if failures:
+            backoff = min(TOKEN_REFRESH_RETRY_MIN * (2 ** (failures - 1)), TOKEN_REFRESH_RETRY_MAX)
+            return backoff + random.uniform(0, backoff / 2)
+        token_info = self._cache_handler.get_cached_token() if self._cache_handler else None
+        if not token_info or "expires_at" not in token_info:
+            return TOKEN_REFRESH_RETRY_MAX
+        return max(0.0, self._token_refresh_due_time(token_info) - time.time())
+
+    def _token_refresh_due_time(self, token_info):
+        """
+        Returns when the token should be refreshed: the margin before expiry plus a jitter.
+        The jitter is picked once per token so the job and its due check agree on it.
+        """
+        expires_at = token_info["expires_at"]
+        planned = self._token_refresh_at
+        if not planned or planned[0] != expires_at:
+            planned = (
+                expires_at,
+                expires_at - TOKEN_REFRESH_MARGIN - random.uniform(0, TOKEN_REFRESH_JITTER),
+            )
+            self._token_refresh_at = planned
+        return planned[1]
+
+    def _refresh_token_if_due(self):
+        """Refreshes the cached token if it is close to expiring. Returns False on failure."""
+        client = self.client
+        if not client or not self._cache_handler:
+            return True
+        token_info = self._cache_handler.get_cached_token()
+        if not token_info or not token_info.get("refresh_token"):
+            return True
+        if "expires_at" in token_info and self._token_refresh_due_time(token_info) > time.time():
+            return True
+        try:
+            client.auth_manager.refresh_access_token(token_info["refresh_token"])
+            log.debug("Spotify: Access token refreshed in the background.")
+            return True
+        except Exception as e:
+            log.warning(f"Spotify: Background token refresh failed: {e}")
+            return False
+
     def _execute(self, command, *args, **kwargs):
         """Wrapper to ensure client and device are ready before executing playback commands."""
         if not self.client:
@@ -152,9 +640,25 @@ class SpotifyClient:
             if "device_id" in command.__code__.co_varnames:
                 kwargs["device_id"] = self.device_id
 
-            result = command(*args, **kwargs)
+            try:
+                result = command(*args, **kwargs)
+            except SpotifyException as e:
+                if not self._is_device_error(e):
+                    raise
+                # The cached device went away; resolve it again and retry once.
+                self.invalidate_device_cache()
+                if not self._ensure_device():
+                    return _(
+                        "No active Spotify device found. Please start playback in your Spotify app."
+                    )
+                if "device_id" in kwargs:
+                    kwargs["device_id"] = self.device_id
+                result = command(*args, **kwargs)
+            self._update_playback_cache(command.__name__, args, kwargs)
             return result
         except SpotifyException as e:
+            if e.http_status == 429:
+                return self._rate_limited_message()
             message = str(e).lower()
             if "restriction" not in message:
                 log.error(f"{_('Spotify command failed:')} {e}", exc_info=True)
@@ -172,16 +676,65 @@ class SpotifyClient:
             return _("An unexpected error occurred.")
 
     def _execute_web_api(self, command, *args, **kwargs):
-        """Wrapper for non-playback API calls that don't require a device."""
+        """
+        Wrapper for non-playback API calls that don't require a device.
+        Identical read-only calls already in flight are joined instead of sent again,
+        as long as the call runs in the caller's lane or a more urgent one.
+        """
         if not self.client:
             return _("Spotify client not ready. Please validate your credentials.")
+        if command.__name__ not in COALESCED_COMMANDS:
+            return self._call_web_api(command, *args, **kwargs)
+
+        request = (command.__name__, args, tuple(sorted(kwargs.items())))
+        try:
+            hash(request)
+        except TypeError:
+            return self._call_web_api(command, *args, **kwargs)
+
+        lane = self._scheduler.current_lane()
+        # An interactive caller must not wait behind a call throttled in the background lane.
+        joinable_lanes = [_RequestScheduler.INTERACTIVE]
+        if lane != _RequestScheduler.INTERACTIVE:
+            joinable_lanes.append(lane)
+        key = (request, lane)
+        with self._inflight_lock:
+            call = next(
+                (
+                    self._inflight_calls[(request, joinable)]
+                    for joinable in joinable_lanes
+                    if (request, joinable) in self._inflight_calls
+                ),
+                None,
+            )
+            is_leader = call is None
+            if is_leader:
+                call = _InFlightCall()
+                self._inflight_calls[key] = call
+        if not is_leader:
+            if call.done.wait(COALESCED_WAIT_TIMEOUT):
+                return copy.deepcopy(call.result)
+            log.debugWarning(f"Spotify: Joined {command.__name__} call is taking too long, sending a new one.")
+            return self._call_web_api(command, *args, **kwargs)
 
+        try:
+            call.result = self._call_web_api(command, *args, **kwargs)
+        finally:
+            with self._inflight_lock:
+                self._inflight_calls.pop(key, None)
+            call.done.set()
+        # Every caller gets its own copy because callers such as the playback cache modify results.
+        return copy.deepcopy(call.result)
+
+    def _call_web_api(self, command, *args, **kwargs):
         try:
             if command.__name__ == 'current_playback':
                 kwargs['additional_types'] = 'episode'
             result = command(*args, **kwargs)
             return result
         except SpotifyException as e:
+            if e.http_status == 429:
+                return self._rate_limited_message()
             log.error(f"{_('Spotify command failed:')} {e}", exc_info=True)
             if e.http_status == 401:  # Unauthorized
                 self.initialize()  # Try to refresh the token silently
@@ -196,6 +749,178 @@ class SpotifyClient:
             )
             return _("An unexpected error occurred.")
 
+    def get_playback_state(self, force_refresh=False, ensure_device=True):
+        """
+        Returns the current playback state, reusing a recent snapshot when possible.
+        Concurrent callers wait for a single in-flight fetch instead of issuing their own,
+        except that an interactive caller never waits on a fetch in the background lane
+        and force_refresh always starts a new fetch.
+        """
+        if not self.client:
+            return _("Spotify client not ready. Please validate your credentials.")
+        lane = self._scheduler.current_lane()
+        with self._playback_lock:
+            if not force_refresh and self._is_playback_cache_fresh():
+                return self._playback_cache
+            call = self._playback_fetch
+            joinable = (
+                not force_refresh
+                and call is not None
+                and (call.lane == _RequestScheduler.INTERACTIVE or lane != _RequestScheduler.INTERACTIVE)
+                and (call.ensure_device or not ensure_device)
+            )
+            if not joinable:
+                call = _InFlightCall(lane, ensure_device)
+                self._playback_fetch = call
+            generation = self._playback_generation
+        if joinable:
+            if call.done.wait(COALESCED_WAIT_TIMEOUT):
+                return call.result
+            log.debugWarning("Spotify: Joined playback fetch is taking too long, sending a new one.")
+            call = _InFlightCall(lane, ensure_device)
+
+        try:
+            call.result = self._fetch_playback_state(ensure_device, generation)
+        finally:
+            with self._playback_lock:
+                if self._playback_fetch is call:
+                    self._playback_fetch = None
+            call.done.set()
+        return call.result
+
+    def _fetch_playback_state(self, ensure_device, generation):
+        """Fetches the playback state and caches it unless a newer snapshot or an invalidation came first."""
+        if ensure_device:
+            playback = self._execute(self.client.current_playback)
+        else:
+            playback = self._execute_web_api(self.client.current_playback)
+        if isinstance(playback, str):
+            return playback
+        with self._playback_lock:
+            if generation != self._playback_generation:
+                return playback
+            self._playback_generation += 1
+            self._playback_cache = playback
+            self._playback_cache_time = time.monotonic()
+            if isinstance(playback, dict):
+                self._anchor_position(playback, playback.get("progress_ms") or 0)
+            else:
+                self._position_anchor = None
+        self._note_playing_item(playback)
+        self._note_playback_device(playback)
+        return playback
+
+    def invalidate_playback_cache(self):
+        """Forces the next get_playback_state call to fetch from the API."""
+        with self._playback_lock:
+            self._playback_generation += 1
+            self._playback_cache = None
+            self._playback_cache_time = 0.0
+            self._position_anchor = None
+
+    def _is_playback_cache_fresh(self):
+        if not self._playback_cache_time:
+            return False
+        return time.monotonic() - self._playback_cache_time < PLAYBACK_CACHE_TTL
+
+    def add_playback_command_listener(self, callback):
+        """Registers callback() to be called after every successful playback command."""
+        self._playback_command_listeners.append(callback)
+
+    def remove_playback_command_listener(self, callback):
+        if callback in self._playback_command_listeners:
+            self._playback_command_listeners.remove(callback)
+
+    def _update_playback_cache(self, command_name, args, kwargs):
+        """Applies the effect of a successful playback command to the cached state."""
+        if command_name == "add_to_queue":
+            self._schedule_queue_prefetch()
+            return
+        if command_name in ("current_playback", "devices", "queue"):
+            return
+        for callback in list(self._playback_command_listeners):
+            try:
+                callback()
+            except Exception:
+                log.error("Spotify: Playback command listener failed.", exc_info=True)
+        # A fetch that started before this command must not overwrite the state it changed.
+        with self._playback_lock:
+            self._playback_generation += 1
+        playback = self._playback_cache
+        if not isinstance(playback, dict):
+            self.invalidate_playback_cache()
+            return
+        if command_name == "pause_playback":
+            self._reanchor_position(playback)
+            playback["is_playing"] = False
+        elif command_name == "start_playback" and not (
+            args or kwargs.get("uris") or kwargs.get("context_uri")
+        ):
+            self._reanchor_position(playback)
+            playback["is_playing"] = True
+        elif command_name == "volume" and playback.get("device"):
+            volume = args[0] if args else kwargs.get("volume_percent")
+            if volume is not None:
+                playback["device"]["volume_percent"] = volume
+        elif command_name == "seek_track" and "position_ms" in kwargs:
+            playback["progress_ms"] = kwargs["position_ms"]
+            self._anchor_position(playback, kwargs["position_ms"])
+        elif command_name == "shuffle" and "state" in kwargs:
+            playback["shuffle_state"] = kwargs["state"]
+        elif command_name == "repeat" and "state" in kwargs:
+            playback["repeat_state"] = kwargs["state"]
+        else:
+            # Track changes, transfers and new contexts can't be predicted locally.
+            self.invalidate_playback_cache()
+
+    def _anchor_position(self, playback, progress_ms):
+        """Records that playback was at progress_ms now, on the monotonic clock."""
+        self._position_anchor = (playback, progress_ms, time.monotonic())
+
+    def _reanchor_position(self, playback):
+        """Pins the extrapolated position before the playing state changes."""
+        estimate = self._estimate_position()
+        if estimate:
+            self._anchor_position(playback, estimate[1])
+        else:
+            self._position_anchor = None
+
+    def _estimate_position(self):
+        """
+        Returns (playback, position_ms) extrapolated from the last snapshot, or None if there
+        is no usable snapshot, it is too old, or the track should already have ended.
+        """
+        anchor = self._position_anchor
+        if not anchor:
+            return None
+        playback, progress_ms, anchored_at = anchor
+        elapsed = time.monotonic() - anchored_at
+        if elapsed > POSITION_MODEL_MAX_AGE or not playback.get("item"):
+            return None
+        position_ms = progress_ms
+        if playback.get("is_playing"):
+            position_ms += int(elapsed * 1000)
+        duration_ms = playback["item"].get("duration_ms") or 0
+        if duration_ms and position_ms >= duration_ms:
+            return None
+        return playback, position_ms
+
+    def get_playback_position(self):
+        """
+        Returns (playback, position_ms) for the current item, or an error message.
+        The position comes from the local model, so Spotify is only asked when the last
+        snapshot is missing, older than POSITION_MODEL_MAX_AGE, or past the end of its track.
+        """
+        estimate = self._estimate_position()
+        if estimate:
+            return estimate
+        playback = self.get_playback_state(force_refresh=True)
+        if isinstance(playback, str):
+            return playback
+        if not playback or not playback.get("item"):
+            return _("Nothing is currently playing.")
+        return self._estimate_position() or (playback, playback.get("progress_ms") or 0)
+
     def send_keep_alive(self):
         """
         Sends a lightweight request to keep the connection active.
@@ -208,13 +933,48 @@ class SpotifyClient:
         except Exception:
             pass
 
+    def invalidate_device_cache(self):
+        """Forces the next playback command to resolve the active device again."""
+        self._device_resolved_at = 0.0
+
+    def _is_device_cache_fresh(self):
+        if not self.device_id or not self._device_resolved_at:
+            return False
+        return time.monotonic() - self._device_resolved_at < DEVICE_CACHE_TTL
+
+    @staticmethod
+    def _is_device_error(error):
+        """Returns True if a SpotifyException means the target device is gone or inactive."""
+        reason = (getattr(error, "reason", None) or "").upper()
+        message = str(error.msg or "").lower()
+        return (
+            reason == "NO_ACTIVE_DEVICE"
+            or "no active device" in message
+            or "device not found" in message
+        )
+
+    def _note_playback_device(self, playback):
+        """Follows device switches made in the Spotify app, as seen in a playback snapshot."""
+        device = playback.get("device") if isinstance(playback, dict) else None
+        if not device or not device.get("id"):
+            return  # Spotify reports no playback at all; commands will find out on their own.
+        if device["id"] != self.device_id:
+            if device.get("is_active"):
+                self.device_id = device["id"]
+                self._device_resolved_at = time.monotonic()
+            else:
+                self.invalidate_device_cache()
+
     def _ensure_device(self):
         """
         Ensures an active device is available for playback.
+        A recently resolved device is reused without another devices() request.
         If no device is currently active, it proactively tries to wake up
         the last known device or the first available one.
         Handles connection errors by retrying once.
         """
+        if self._is_device_cache_fresh():
+            return True
         try:
             # First attempt to get devices
             devices_result = self.client.devices()
@@ -229,12 +989,14 @@ class SpotifyClient:
             return False
 
         if not devices_result or not devices_result.get("devices"):
+            self.invalidate_device_cache()
             return False
         devices = devices_result["devices"]
 
         for device in devices:
             if device.get("is_active"):
                 self.device_id = device["id"]
+                self._device_resolved_at = time.monotonic()
                 return True
 
         target_device_id = None
@@ -249,16 +1011,18 @@ class SpotifyClient:
             try:
                 self.client.transfer_playback(target_device_id, force_play=False)
                 self.device_id = target_device_id
+                self._device_resolved_at = time.monotonic()
                 return True
             except Exception as e:
                 log.error(f"{_('Spotify: Failed to wake up device:')} {e}", exc_info=True)
                 self.device_id = None # Reset karena gagal
+                self.invalidate_device_cache()
                 return False
         return False
 
     def get_current_track_info(self, playback=None):
         if playback is None:
-            playback = self._execute(self.client.current_playback)
+            playback = self.get_playback_state()
         if isinstance(playback, str):
             return playback
         if not playback or not playback.get("item") or not playback.get("is_playing"):
@@ -311,7 +1075,7 @@ class SpotifyClient:
             return item.get("name", "")
 
     def get_current_track_url(self):
-        playback = self._execute(self.client.current_playback)
+        playback = self.get_playback_state()
         if isinstance(playback, str):
             return playback
         if not playback or not playback.get("item"):
@@ -327,13 +1091,10 @@ class SpotifyClient:
         Retrieves the current playback position and the track's total duration,
         formats them, and returns a descriptive string.
         """
-        playback = self._execute(self.client.current_playback)
-        if isinstance(playback, str):
-            return playback
-        if not playback or not playback.get("item"):
-            return _("Nothing is currently playing.")
-
-        progress_ms = playback.get("progress_ms", 0)
+        position = self.get_playback_position()
+        if isinstance(position, str):
+            return position
+        playback, progress_ms = position
         duration_ms = playback["item"].get("duration_ms", 0)
 
         current_min, current_sec = divmod(progress_ms // 1000, 60)
@@ -347,17 +1108,55 @@ class SpotifyClient:
         )
 
     def search(self, query, search_type="track", offset=0):
+        """
+        Searches the catalog, reusing recently fetched result pages.
+        search_type may be "all" or a comma-separated list of types; each section of a
+        combined response is also cached on its own, so single-type searches reuse it.
+        """
         if not query:
             return None
 
+        if search_type == "all":
+            search_type = ",".join(ALL_SEARCH_TYPES)
         limit = config.conf["spotify"]["searchLimit"]
+        normalized_query = " ".join(query.split()).casefold()
+        key = (normalized_query, search_type, offset, limit)
+        with self._search_cache_lock:
+            cached = self._search_cache.get(key)
+            if cached and time.monotonic() - cached[0] < SEARCH_CACHE_TTL:
+                self._search_cache.move_to_end(key)
+                return cached[1]
+
         results = self._execute_web_api(
             self.client.search, q=query, type=search_type, limit=limit, offset=offset
         )
         if isinstance(results, str):
             return results
+        with self._search_cache_lock:
+            self._cache_search_page(key, results)
+            if "," in search_type:
+                for section_type in search_type.split(","):
+                    section_key = section_type + "s"
+                    if isinstance(results, dict) and section_key in results:
+                        self._cache_search_page(
+                            (normalized_query, section_type, offset, limit),
+                            {section_key: results[section_key]},
+                        )
         return results
 
+    def _cache_search_page(self, key, results):
+        self._search_cache[key] = (time.monotonic(), results)
+        self._search_cache.move_to_end(key)
+        while len(self._search_cache) > SEARCH_CACHE_SIZE:
+            self._search_cache.popitem(last=False)
+
+    def prefetch_search(self, query, search_type="track", offset=0):
+        """Loads a search result page into the cache in the background lane."""
+        if not self.client:
+            return
+        with self.background_requests():
+            self.search(query, search_type, offset=offset)
+
     def play_item(self, uris):
         """
         Plays a track, episode, album, artist, playlist, or a list of tracks.
@@ -401,6 +1200,39 @@ class SpotifyClient:
     def add_to_queue(self, uri):
         return self._execute(self.client.add_to_queue, uri=uri)
 
+    def add_many_to_queue(self, uris, on_progress=None, cancel_event=None):
+        """
+        Adds several items to the queue in list order.
+        The device is resolved once, then the items are sent one at a time in the background lane.
+        on_progress(done, total) is called every few seconds; setting cancel_event stops
+        sending further items. Returns (queued_count, error_message_or_None).
+        """
+        if not self.client:
+            return 0, _("Spotify client not ready. Please validate your credentials.")
+        if not self._ensure_device():
+            return 0, _(
+                "No active Spotify device found. Please start playback in your Spotify app."
+            )
+
+        total = len(uris)
+        done = 0
+        last_report = time.monotonic()
+        # Each request waits for the previous one so Spotify queues the items in list order,
+        # and the whole batch yields to interactive commands.
+        with self.background_requests():
+            for uri in uris:
+                if cancel_event and cancel_event.is_set():
+                    break
+                result = self._execute(self.client.add_to_queue, uri=uri)
+                if isinstance(result, str):
+                    return done, result
+                done += 1
+                now = time.monotonic()
+                if on_progress and now - last_report >= QUEUE_PROGRESS_INTERVAL:
+                    last_report = now
+                    on_progress(done, total)
+        return done, None
+
     def get_track_details_from_url(self, url):
         info = self.get_link_details(url)
         if "error" in info:
@@ -415,7 +1247,130 @@ class SpotifyClient:
             "duration": metadata.get("duration"),
         }
 
+    @staticmethod
+    def _item_uri(playback):
+        if not isinstance(playback, dict):
+            return None
+        return (playback.get("item") or {}).get("uri")
+
+    def _note_playing_item(self, playback):
+        """Refreshes the queue copy in the background whenever a different item starts playing."""
+        uri = self._item_uri(playback)
+        if uri == self._last_item_uri:
+            return
+        self._last_item_uri = uri
+        if uri:
+            self._schedule_queue_prefetch()
+        else:
+            self._queue_snapshot = None
+
+    def _schedule_queue_prefetch(self):
+        self._queue_snapshot = None
+        self.heartbeat.add_job("queue_prefetch", self._prefetch_queue_job, delay=QUEUE_PREFETCH_DELAY)
+
+    def _prefetch_queue_job(self):
+        if not self.client:
+            return None
+        with self.background_requests():
+            queue_data = self._execute_web_api(self.client.queue)
+        if isinstance(queue_data, dict):
+            self._queue_snapshot = (queue_data, time.monotonic())
+        return None
+
+    def _get_queue_snapshot(self):
+        """Returns the prefetched queue if it still belongs to the playing item, or None."""
+        snapshot = self._queue_snapshot
+        if not snapshot or time.monotonic() - snapshot[1] > QUEUE_SNAPSHOT_MAX_AGE:
+            return None
+        queue_data = snapshot[0]
+        if (queue_data.get("currently_playing") or {}).get("uri") != self._last_item_uri:
+            return None
+        return queue_data
+
+    def skip_next(self, on_message=None):
+        """
+        Skips to the next item and returns the announcement for it.
+        When the prefetched queue is current, the next item is announced without waiting for
+        Spotify; a background check then calls on_message(message) only if something else plays.
+        """
+        if not self.client:
+            return _("Spotify client not ready. Please validate your credentials.")
+        previous_uri = self._last_item_uri
+        queue_data = self._get_queue_snapshot()
+        upcoming = self._get_filtered_queue_items(queue_data) if queue_data else []
+        result = self._execute(self.client.next_track)
+        if isinstance(result, str):
+            return result
+        if not upcoming:
+            playback = self._wait_for_track_change(previous_uri)
+            if isinstance(playback, dict):
+                return self.get_current_track_info(playback)
+            return playback if isinstance(playback, str) else _("Next track")
+
+        expected = upcoming[0]
+        # Move the queue copy along so another press can be predicted as well.
+        self._last_item_uri = expected.get("uri")
+        self._queue_snapshot = (
+            {"currently_playing": expected, "queue": upcoming[1:]}, time.monotonic()
+        )
+        self._confirm_track_change(previous_uri, expected.get("uri"), on_message)
+        return self.get_current_track_info(
+            {"item": expected, "is_playing": True, "currently_playing_type": expected.get("type")}
+        )
+
+    def skip_previous(self):
+        """Skips to the previous item and returns the announcement for what is playing then."""
+        if not self.client:
+            return _("Spotify client not ready. Please validate your credentials.")
+        previous_uri = self._last_item_uri
+        estimate = self._estimate_position()
+        result = self._execute(self.client.previous_track)
+        if isinstance(result, str):
+            return result
+        playback = self._wait_for_track_change(previous_uri, estimate[1] if estimate else None)
+        if isinstance(playback, dict):
+            return self.get_current_track_info(playback)
+        return playback if isinstance(playback, str) else _("Previous track")
+
+    def _wait_for_track_change(self, previous_uri, previous_position_ms=None):
+        """
+        Polls with short, growing pauses until Spotify reports another item, or the same item
+        restarted, and returns the last playback state.
+        """
+        playback = None
+        for delay in TRACK_CHANGE_POLL_DELAYS:
+            time.sleep(delay)
+            playback = self.get_playback_state(force_refresh=True)
+            if not isinstance(playback, dict) or self._item_uri(playback) != previous_uri:
+                break
+            if previous_position_ms is not None and (playback.get("progress_ms") or 0) < previous_position_ms - 1000:
+                break
+        return playback
+
+    def _confirm_track_change(self, previous_uri, expected_uri, on_message):
+        """Checks in the background that a predicted skip landed on the expected item."""
+        delays = iter(TRACK_CHANGE_POLL_DELAYS[1:])
+
+        def confirm():
+            playback = self.get_playback_state(force_refresh=True)
+            if not isinstance(playback, dict):
+                return None
+            uri = self._item_uri(playback)
+            if uri == expected_uri:
+                return None
+            if uri == previous_uri:
+                delay = next(delays, None)
+                if delay is not None:
+                    return delay  # Spotify has not switched yet.
+            if on_message:
+                on_message(self.get_current_track_info(playback))
+            return None
+
+        self.heartbeat.add_job("confirm_skip", confirm, delay=TRACK_CHANGE_POLL_DELAYS[0])
+
     def get_next_track_in_queue(self, queue_data=None):
+        if queue_data is None:
+            queue_data = self._get_queue_snapshot()
         if queue_data is None:
             queue_data = self._execute_web_api(self.client.queue)
         if isinstance(queue_data, str):
@@ -514,17 +1469,19 @@ class SpotifyClient:
         return filtered
 
     def rebuild_queue(self, uris, progress_ms=0):
-        result = self._execute(self.client.start_playback, uris=uris)
+        result = self._execute(
+            self.client.start_playback, uris=uris, position_ms=progress_ms or None
+        )
         if isinstance(result, str):
             return result
-        if progress_ms:
-            self.seek_track(progress_ms)
         return True
 
-    def skip_to_queue_index(self, target_index):
+    def skip_to_queue_index(self, target_index, expected_uri=None):
         """
-        Skips forward in the queue by issuing next-track commands until the
-        desired absolute position (0 = currently playing) is reached.
+        Plays the item at the given absolute queue position (0 = currently playing).
+        Distant items are reached with a single start_playback of the target and the rest
+        of the queue; playback then ends with the queue instead of resuming the context.
+        Close items, or jumps that can't be done that way, skip with next-track commands.
         """
         try:
             index = int(target_index)
@@ -534,19 +1491,46 @@ class SpotifyClient:
         if index <= 0:
             return _("Already playing the selected item.")
 
-        for _ in range(index):
+        if index >= QUEUE_JUMP_MIN_DISTANCE:
+            message = self._jump_to_queue_index(index, expected_uri)
+            if message:
+                return message
+
+        for _i in range(index):
             result = self._execute(self.client.next_track)
             if isinstance(result, str):
                 return result
             time.sleep(0.2)
 
-        playback = self._execute(self.client.current_playback)
+        playback = self.get_playback_state(force_refresh=True)
         if isinstance(playback, str):
             return playback
         if playback and playback.get("item"):
             return self.get_current_track_info(playback)
         return _("Nothing is currently playing.")
 
+    def _jump_to_queue_index(self, index, expected_uri):
+        """Restarts playback from a queue item. Returns None if skipping should be used instead."""
+        queue_data = self._execute_web_api(self.client.queue)
+        if isinstance(queue_data, str):
+            return None
+        items = self._get_filtered_queue_items(queue_data)
+        if index > len(items):
+            return None
+        target = items[index - 1]
+        if expected_uri and target.get("uri") != expected_uri:
+            return None  # The queue moved on since it was listed.
+        uris = [item.get("uri") for item in items[index - 1:]]
+        if any(uri.startswith("spotify:local:") for uri in uris):
+            return None  # Local files can't be started by URI.
+        result = self.rebuild_queue(uris)
+        if isinstance(result, str):
+            log.debug(f"Spotify: Queue jump failed, skipping track by track instead: {result}")
+            return None
+        return self.get_current_track_info(
+            {"item": target, "is_playing": True, "currently_playing_type": target.get("type")}
+        )
+
     def clear_credentials_and_cache(self):
         """Clears clientID from its dedicated file and deletes the Spotify token cache."""
         try:
@@ -564,6 +1548,13 @@ class SpotifyClient:
                 )
 
             self.client = None
+            if self._cache_handler:
+                self._cache_handler.clear()
+            if self._library_store:
+                self._library_store.clear()
+            self._current_user_id = None
+            self.invalidate_playback_cache()
+            self.invalidate_device_cache()
             return _("Spotify credentials and cache cleared successfully.")
         except Exception as e:
             log.error(
@@ -574,15 +1565,111 @@ class SpotifyClient:
                 error=e
             )
 
-    def seek_track(self, offset_ms):
-        """Seeks the current track forward or backward by offset_ms."""
-        playback = self._execute(self.client.current_playback)
+    def adjust_volume(self, delta, on_error=None):
+        """
+        Moves the target volume by delta and returns the new value, or an error message.
+        Only the first press of a burst may need to read the current volume from Spotify;
+        later presses build on the local target. on_error(message) is called from a
+        background thread if sending the volume fails.
+        """
+        device_volume = None
+        while True:
+            with self._volume_lock:
+                # A target set meanwhile (e.g. from the volume dialog) takes precedence.
+                base = self._volume_target if self._volume_target is not None else device_volume
+                if base is not None:
+                    return self._request_volume(base + delta, on_error)
+            # Read outside the lock: the volume dialog takes it on the GUI thread.
+            device_volume = self._read_device_volume()
+            if isinstance(device_volume, str):
+                return device_volume
+
+    def set_volume(self, volume, on_error=None):
+        """Sets the target volume to an absolute value; see adjust_volume."""
+        if not self.client:
+            return _("Spotify client not ready. Please validate your credentials.")
+        with self._volume_lock:
+            return self._request_volume(volume, on_error)
+
+    def get_known_volume(self):
+        """Returns the target or last known volume without contacting Spotify, or None."""
+        with self._volume_lock:
+            if self._volume_target is not None:
+                return self._volume_target
+        playback = self._playback_cache
+        if isinstance(playback, dict) and playback.get("device"):
+            return playback["device"].get("volume_percent")
+        return None
+
+    def _read_device_volume(self):
+        playback = self.get_playback_state()
         if isinstance(playback, str):
             return playback
-        if not playback or not playback.get("item"):
-            return _("Nothing is currently playing.")
+        device = playback.get("device") if isinstance(playback, dict) else None
+        if not device or device.get("volume_percent") is None:
+            return _("No active device found.")
+        if device.get("supports_volume") is False:
+            return _("This device does not support volume control.")
+        return device["volume_percent"]
+
+    def _request_volume(self, volume, on_error):
+        """Records a new target and (re)starts the send delay. The caller holds _volume_lock."""
+        volume = max(0, min(100, int(volume)))
+        self._volume_target = volume
+        self._volume_error_callback = on_error
+        self._volume_send.schedule(VOLUME_SEND_DELAY)
+        return volume
+
+    def _send_volume_job(self):
+        with self._volume_lock:
+            volume = self._volume_target
+            on_error = self._volume_error_callback
+            if volume is None or volume == self._volume_sent:
+                return None
+        if not self.client:
+            result = _("Spotify client not ready. Please validate your credentials.")
+        else:
+            result = self._execute(self.client.volume, volume)
+        if isinstance(result, str):
+            with self._volume_lock:
+                if self._volume_target == volume:
+                    # Start the next press from Spotify's real volume.
+                    self._volume_target = None
+                    self._volume_sent = None
+            if on_error:
+                on_error(result)
+            return None
+        with self._volume_lock:
+            self._volume_sent = volume
+        self._volume_reconcile.schedule(VOLUME_RECONCILE_DELAY)
+        return None
 
-        current_position_ms = playback.get("progress_ms", 0)
+    def _reconcile_volume_job(self):
+        """Once presses have settled, drops the local target in favour of Spotify's state."""
+        with self._volume_lock:
+            volume = self._volume_target
+            if volume is None or volume != self._volume_sent:
+                return None  # A newer value is still waiting to be sent.
+        with self.background_requests():
+            playback = self.get_playback_state(force_refresh=True)
+        with self._volume_lock:
+            if self._volume_target != volume:
+                return None
+            self._volume_target = None
+            self._volume_sent = None
+        device = playback.get("device") if isinstance(playback, dict) else None
+        if device and device.get("volume_percent") not in (None, volume):
+            log.debug(
+                f"Spotify: Device reports volume {device['volume_percent']}% after setting {volume}%."
+            )
+        return None
+
+    def seek_track(self, offset_ms):
+        """Seeks the current track forward or backward by offset_ms."""
+        position = self.get_playback_position()
+        if isinstance(position, str):
+            return position
+        playback, current_position_ms = position
         track_duration_ms = playback["item"].get("duration_ms", 0)
 
         new_position_ms = current_position_ms + offset_ms
@@ -591,6 +1678,53 @@ class SpotifyClient:
 
         return self._execute(self.client.seek_track, position_ms=new_position_ms)
 
+    def seek_relative(self, offset_ms, on_error=None):
+        """
+        Moves the playback position by offset_ms and returns the new position, or an error message.
+        Presses in quick succession add up locally and are sent as one seek once they pause
+        for SEEK_SEND_DELAY. on_error(message) is called from a background thread if it fails.
+        """
+        with self._seek_lock:
+            if self._seek_request:
+                playback = self._seek_request[0]
+                base_ms = self._project_seek_target(self._seek_request)
+            else:
+                position = self.get_playback_position()
+                if isinstance(position, str):
+                    return position
+                playback, base_ms = position
+            duration_ms = playback["item"].get("duration_ms", 0)
+            target_ms = max(0, min(base_ms + offset_ms, duration_ms))
+            self._seek_request = (playback, target_ms, time.monotonic(), on_error)
+            self._anchor_position(playback, target_ms)
+            self._seek_send.schedule(SEEK_SEND_DELAY)
+            return target_ms
+
+    @staticmethod
+    def _project_seek_target(request):
+        """Returns where a requested seek lands now, counting the time playback kept running."""
+        playback, target_ms, requested_at, _on_error = request
+        if playback.get("is_playing"):
+            target_ms += int((time.monotonic() - requested_at) * 1000)
+        return min(target_ms, playback["item"].get("duration_ms", 0))
+
+    def _send_seek_job(self):
+        with self._seek_lock:
+            request = self._seek_request
+            self._seek_request = None
+        if not request:
+            return None
+        if not self.client:
+            result = _("Spotify client not ready. Please validate your credentials.")
+        else:
+            result = self._execute(self.client.seek_track, position_ms=self._project_seek_target(request))
+        if isinstance(result, str):
+            self._position_anchor = None
+            on_error = request[3]
+            if on_error:
+                on_error(result)
+        return None
+
     def smart_seek(self, time_input):
         """
         Parses a string input to determine absolute or relative seek.
@@ -598,14 +1732,12 @@ class SpotifyClient:
         - "30" -> Relative forward (Jump 30s).
         - "-10" -> Relative backward (Rewind 10s).
         """
-        playback = self._execute(self.client.current_playback)
-        if isinstance(playback, str): return playback
-        if not playback or not playback.get("item"):
-            return _("Nothing is currently playing.")
+        position = self.get_playback_position()
+        if isinstance(position, str): return position
+        playback, current_ms = position
 
         try:
             target_ms = 0
-            current_ms = playback.get("progress_ms", 0)
             duration_ms = playback["item"].get("duration_ms", 0)
             
             if ":" in time_input:
@@ -626,88 +1758,195 @@ class SpotifyClient:
         except ValueError:
             return _("Invalid time format. Use 'mm:ss' or just a number.")
 
-    def toggle_shuffle(self):
+    def toggle_playback(self, on_message=None):
+        """Pauses or resumes playback; see _toggle_setting."""
+        return self._toggle_setting("is_playing", lambda playing: not playing, on_message)
+
+    def toggle_shuffle(self, on_message=None):
         """Toggles shuffle mode on or off."""
-        playback = self._execute(self.client.current_playback)
-        if isinstance(playback, str): return playback
-        
-        # Jika tidak ada playback aktif
-        if not playback or not isinstance(playback, dict):
-            return _("No active playback found. Please play something first.")
+        return self._toggle_setting("shuffle_state", lambda shuffle: not shuffle, on_message)
 
-        # Cek status sekarang
-        current_state = playback.get("shuffle_state")
-        new_state = not current_state
-        
-        try:
-            # Kita panggil langsung lewat _execute agar handle device_id otomatis
-            result = self._execute(self.client.shuffle, state=new_state)
-            if isinstance(result, str) and "restriction" in result.lower():
+    def cycle_repeat(self, on_message=None):
+        """Cycles repeat mode: off -> context (album/playlist) -> track -> off."""
+        next_state = {"off": "context", "context": "track"}
+        return self._toggle_setting(
+            "repeat_state", lambda state: next_state.get(state, "off"), on_message
+        )
+
+    def _toggle_setting(self, setting, choose_next, on_message):
+        """
+        Changes a playback setting optimistically and returns the announcement for its new value.
+        The value is computed from the cached playback state, or from the value still waiting
+        to be sent, so repeated presses need no request. on_message(message) is called from a
+        background thread if the command fails or Spotify later reports a different value.
+        """
+        with self._toggle_lock:
+            pending = self._pending_toggles.get(setting)
+            if pending:
+                current, original = pending[0], pending[1]
+            else:
+                playback = self._get_toggle_base()
+                if isinstance(playback, str):
+                    return playback
+                if not playback and setting != "is_playing":
+                    return _("No active playback found. Please play something first.")
+                current = original = playback.get(setting) if playback else False
+            new_value = choose_next(current)
+            self._pending_toggles[setting] = (new_value, original, on_message)
+            self._set_cached_setting(setting, new_value)
+            self._toggle_send.schedule(TOGGLE_SEND_DELAY)
+        return self._describe_setting(setting, new_value)
+
+    def _get_toggle_base(self):
+        playback = self._playback_cache
+        if isinstance(playback, dict) and time.monotonic() - self._playback_cache_time < TOGGLE_STATE_MAX_AGE:
+            return playback
+        return self.get_playback_state()
+
+    def _set_cached_setting(self, setting, value):
+        playback = self._playback_cache
+        if not isinstance(playback, dict):
+            return
+        if setting == "is_playing":
+            self._reanchor_position(playback)
+        playback[setting] = value
+
+    @staticmethod
+    def _describe_setting(setting, value):
+        if setting == "is_playing":
+            return _("Playing") if value else _("Paused")
+        if setting == "shuffle_state":
+            return _("Shuffle On") if value else _("Shuffle Off")
+        if value == "context":
+            return _("Repeat: All")
+        if value == "track":
+            return _("Repeat: One Track")
+        return _("Repeat: Off")
+
+    def _send_toggle(self, setting, value):
+        if not self.client:
+            return _("Spotify client not ready. Please validate your credentials.")
+        if setting == "is_playing":
+            command = self.client.start_playback if value else self.client.pause_playback
+            return self._execute(command)
+        command = self.client.shuffle if setting == "shuffle_state" else self.client.repeat
+        result = self._execute(command, state=value)
+        if isinstance(result, str) and "restriction" in result.lower():
+            if setting == "shuffle_state":
                 return _("Failed: Spotify Premium is required for Shuffle control.")
-            if isinstance(result, str): 
-                return result # Return error message lain jika ada
-            
-            return _("Shuffle On") if new_state else _("Shuffle Off")
-        except Exception as e:
-             return _("Could not toggle shuffle. (Premium might be required).")
+            return _("Failed: Spotify Premium is required for Repeat control.")
+        return result
+
+    def _send_toggles_job(self):
+        with self._toggle_lock:
+            pending = self._pending_toggles
+            self._pending_toggles = {}
+        sent = {}
+        for setting, (value, original, on_message) in pending.items():
+            if value == original:
+                continue  # The presses cancelled each other out.
+            result = self._send_toggle(setting, value)
+            if isinstance(result, str):
+                with self._toggle_lock:
+                    if setting not in self._pending_toggles:
+                        self._set_cached_setting(setting, original)
+                if on_message:
+                    on_message(result)
+            else:
+                sent[setting] = (value, on_message)
+        if sent:
+            with self._toggle_lock:
+                self._sent_toggles.update(sent)
+            self._toggle_reconcile.schedule(TOGGLE_RECONCILE_DELAY)
+        return None
 
-    def cycle_repeat(self):
-        """Cycles repeat mode: off -> context (album/playlist) -> track -> off."""
-        playback = self._execute(self.client.current_playback)
-        if isinstance(playback, str): return playback
-        
-        if not playback or not isinstance(playback, dict):
-            return _("No active playback found. Please play something first.")
+    def _reconcile_toggles_job(self):
+        """Announces the real value of a toggle when Spotify did not end up where we said."""
+        with self._toggle_lock:
+            sent = self._sent_toggles
+            self._sent_toggles = {}
+        if not sent:
+            return None
+        with self.background_requests():
+            playback = self.get_playback_state(force_refresh=True)
+        if not isinstance(playback, dict):
+            return None
+        for setting, (value, on_message) in sent.items():
+            with self._toggle_lock:
+                if setting in self._pending_toggles:
+                    continue  # Pressed again since; that press will be checked instead.
+            actual = playback.get(setting)
+            if actual is not None and actual != value and on_message:
+                on_message(self._describe_setting(setting, actual))
+        return None
 
-        current_state = playback.get("repeat_state") # 'off', 'context', 'track'
-        
-        # Tentukan state berikutnya
-        if current_state == "off":
-            new_state = "context"
-            message = _("Repeat: All")
-        elif current_state == "context":
-            new_state = "track"
-            message = _("Repeat: One Track")
-        else:
-            new_state = "off"
-            message = _("Repeat: Off")
+    def _fetch_all_pages(self, command, limit=50, **kwargs):
+        """
+        Fetches every item from an offset-paginated endpoint.
+        The first page tells us the total; the remaining pages are fetched
+        concurrently and returned in their original order.
+        """
+        first_page = self._execute_web_api(command, limit=limit, offset=0, **kwargs)
+        if isinstance(first_page, str):
+            return first_page  # Error message
+        if not first_page:
+            return []
 
-        try:
-            result = self._execute(self.client.repeat, state=new_state)
-            if isinstance(result, str) and "restriction" in result.lower():
-                return _("Failed: Spotify Premium is required for Repeat control.")
-            if isinstance(result, str): 
-                return result
-            
-            return message
-        except Exception as e:
-            return _("Could not change repeat mode. (Premium might be required).")
+        items = list(first_page.get("items") or [])
+        total = first_page.get("total")
+        if len(items) < limit:
+            return items
+        if total is None:
+            return self._fetch_remaining_pages_serially(command, limit, items, **kwargs)
 
-    def get_user_playlists(self):
-        """Fetches all playlists owned by or followed by the current user."""
-        playlists = []
-        offset = 0
-        limit = 50  # Max limit per request
+        lane = self._scheduler.current_lane()
+
+        def fetch_page(offset):
+            with self._scheduler.lane(lane):
+                return self._execute_web_api(command, limit=limit, offset=offset, **kwargs)
+
+        pages = utils.map_in_pool(fetch_page, range(limit, total, limit))
+        for page in pages:
+            if isinstance(page, str):
+                return page
+            items.extend((page or {}).get("items") or [])
+        return items
+
+    def _fetch_remaining_pages_serially(self, command, limit, items, **kwargs):
+        """Fallback for endpoints that don't report a total."""
+        offset = len(items)
         while True:
-            results = self._execute_web_api(
-                self.client.current_user_playlists, limit=limit, offset=offset
-            )
+            results = self._execute_web_api(command, limit=limit, offset=offset, **kwargs)
             if isinstance(results, str):
-                return results  # Error message
-
-            if not results or not results.get("items"):
+                return results
+            page_items = (results or {}).get("items") or []
+            if not page_items:
                 break
-            playlists.extend(results["items"])
-            if len(results["items"]) < limit:
+            items.extend(page_items)
+            if len(page_items) < limit:
                 break
-            offset += limit
-        return playlists
+            offset += len(page_items)
+        return items
 
-    def add_track_to_playlist(self, playlist_id, track_uri):
-        """Adds a track to a specified playlist."""
-        return self._execute_web_api(
+    def get_user_playlists(self):
+        """Fetches all playlists owned by or followed by the current user."""
+        return self._fetch_all_pages(self.client.current_user_playlists, limit=50)
+
+    def add_track_to_playlist(self, playlist_id, track_uri, track=None):
+        """
+        Adds a track to a specified playlist.
+        Pass the track object when available so the cached playlist can be updated in place.
+        """
+        result = self._execute_web_api(
             self.client.playlist_add_items, playlist_id=playlist_id, items=[track_uri]
         )
+        if not isinstance(result, str):
+            edit = None
+            if track:
+                def edit(items):
+                    items.append({"added_at": None, "track": track})
+            self._apply_playlist_edit(playlist_id, result, edit)
+        return result
 
     def create_playlist(self, name, public=True, collaborative=False, description=""):
         """Creates a new playlist for the current user."""
@@ -737,9 +1976,12 @@ class SpotifyClient:
             log.error(f"Could not get user ID: {e}", exc_info=True)
             return _("Could not retrieve user ID.")
 
-        return self._execute_web_api(
+        result = self._execute_web_api(
             self.client.user_playlist_unfollow, user=user_id, playlist_id=playlist_id
         )
+        if not isinstance(result, str):
+            self.invalidate_library_index()
+        return result
 
     def update_playlist_details(
         self, playlist_id, name=None, public=None, collaborative=None, description=None
@@ -754,33 +1996,103 @@ class SpotifyClient:
             description=description,
         )
 
-    def get_playlist_tracks(self, playlist_id):
-        """Fetches all tracks from a specified playlist."""
-        tracks = []
-        offset = 0
-        limit = 100  # Max limit per request
-        while True:
-            results = self.get_playlist_tracks_page(playlist_id, limit=limit, offset=offset)
-            if isinstance(results, str):
-                return results  # Error message
-
-            items = results.get("items", []) if results else []
-            if not items:
-                break
-            tracks.extend(items)
-            if len(items) < limit:
-                break
-            offset += len(items)
+    def get_playlist_tracks(self, playlist_id, snapshot_id=None):
+        """
+        Fetches all tracks from a specified playlist.
+        When the playlist's snapshot_id is given, an unchanged playlist is served from memory.
+        """
+        cached = self._get_cached_playlist_tracks(playlist_id, snapshot_id)
+        if cached is not None:
+            return cached
+        tracks = self._fetch_all_pages(
+            self.client.playlist_items, limit=100, playlist_id=playlist_id
+        )
+        if snapshot_id and not isinstance(tracks, str):
+            self._store_playlist_tracks(playlist_id, snapshot_id, 0, tracks, len(tracks))
         return tracks
 
-    def get_playlist_tracks_page(self, playlist_id, limit=50, offset=0):
+    def get_playlist_tracks_page(self, playlist_id, limit=50, offset=0, snapshot_id=None):
         """Gets a single page of tracks from a playlist."""
-        return self._execute_web_api(
+        cached = self._get_cached_playlist_tracks(playlist_id, snapshot_id)
+        if cached is not None:
+            return {"items": cached[offset:offset + limit], "total": len(cached)}
+        results = self._execute_web_api(
             self.client.playlist_items,
             playlist_id=playlist_id,
             limit=limit,
             offset=offset,
         )
+        if snapshot_id and isinstance(results, dict):
+            self._store_playlist_tracks(
+                playlist_id, snapshot_id, offset, results.get("items") or [], results.get("total")
+            )
+        return results
+
+    def _get_cached_playlist_tracks(self, playlist_id, snapshot_id):
+        """Returns a copy of the cached tracks if they match snapshot_id, otherwise None."""
+        if not snapshot_id:
+            return None
+        with self._playlist_cache_lock:
+            entry = self._playlist_cache.get(playlist_id)
+            if not entry or not entry["complete"]:
+                return None
+            if snapshot_id != entry["snapshot_id"] and snapshot_id not in entry["own_snapshots"]:
+                return None
+            self._playlist_cache.move_to_end(playlist_id)
+            return list(entry["items"])
+
+    def _store_playlist_tracks(self, playlist_id, snapshot_id, offset, items, total):
+        """
+        Adds fetched playlist items to the cache.
+        Pages must arrive in order; the entry is usable once it holds all `total` items.
+        """
+        with self._playlist_cache_lock:
+            entry = self._playlist_cache.get(playlist_id)
+            if offset == 0 or not entry or entry["snapshot_id"] != snapshot_id:
+                if offset != 0:
+                    return
+                entry = {
+                    "snapshot_id": snapshot_id,
+                    "own_snapshots": set(),
+                    "items": [],
+                    "complete": False,
+                }
+                self._playlist_cache[playlist_id] = entry
+            if entry["complete"] or len(entry["items"]) != offset:
+                return
+            entry["items"].extend(items)
+            entry["complete"] = total is not None and len(entry["items"]) >= total
+            self._playlist_cache.move_to_end(playlist_id)
+            while len(self._playlist_cache) > PLAYLIST_CACHE_SIZE:
+                self._playlist_cache.popitem(last=False)
+
+    def _apply_playlist_edit(self, playlist_id, result, edit):
+        """
+        Applies one of our own successful edits to the cached playlist.
+        `edit` changes the cached item list in place; the new snapshot_id from the response
+        becomes current and the previous one stays valid, since the only change was ours.
+        Returns True if the cached copy was updated.
+        """
+        with self._playlist_cache_lock:
+            entry = self._playlist_cache.get(playlist_id)
+            if not entry:
+                return False
+            new_snapshot = result.get("snapshot_id") if isinstance(result, dict) else None
+            if not entry["complete"] or not new_snapshot or edit is None:
+                del self._playlist_cache[playlist_id]
+                return False
+            edit(entry["items"])
+            entry["own_snapshots"].add(entry["snapshot_id"])
+            entry["snapshot_id"] = new_snapshot
+            return True
+
+    def invalidate_playlist_cache(self, playlist_id=None):
+        """Forgets the cached tracks of one playlist, or of all playlists."""
+        with self._playlist_cache_lock:
+            if playlist_id is None:
+                self._playlist_cache.clear()
+            else:
+                self._playlist_cache.pop(playlist_id, None)
 
     def get_context_track_uris(self, uri, item_type):
         """Returns a flat list of track URIs for supported context types."""
@@ -812,11 +2124,21 @@ class SpotifyClient:
         """Removes tracks from a specified playlist."""
         log.info(f"remove_tracks_from_playlist called with: {track_uris}")
         # This specific spotipy function expects a list of URI strings, not dicts.
-        return self._execute_web_api(
+        result = self._execute_web_api(
             self.client.playlist_remove_all_occurrences_of_items,
             playlist_id=playlist_id,
             items=track_uris,
         )
+        if not isinstance(result, str):
+            removed = set(track_uris)
+
+            def edit(items):
+                items[:] = [
+                    item for item in items
+                    if ((item or {}).get("track") or {}).get("uri") not in removed
+                ]
+            self._apply_playlist_edit(playlist_id, result, edit)
+        return result
 
     def reorder_playlist_track(self, playlist_id, from_index, to_index):
         """Moves a track in a playlist from one position to another."""
@@ -824,12 +2146,18 @@ class SpotifyClient:
         # If we move a track down (e.g., from index 2 to 3), we insert it before index 4.
         insert_before = to_index + 1 if from_index < to_index else to_index
         
-        return self._execute_web_api(
+        result = self._execute_web_api(
             self.client.playlist_reorder_items,
             playlist_id=playlist_id,
             range_start=from_index,
             insert_before=insert_before
         )
+        if not isinstance(result, str):
+            def edit(items):
+                if 0 <= from_index < len(items) and 0 <= to_index < len(items):
+                    items.insert(to_index, items.pop(from_index))
+            self._apply_playlist_edit(playlist_id, result, edit)
+        return result
 
     def get_link_details(self, url: str) -> dict:
         """Returns metadata for a spotify link (track, playlist, album, artist, show, episode)."""
@@ -881,37 +2209,159 @@ class SpotifyClient:
         info["typeLabel"] = self._get_type_label(entity_type)
         return info
 
-    def get_saved_tracks(self):
-        """Fetches all saved tracks from the user's library."""
-        tracks = []
+    def _get_library_store(self):
+        """Returns the on-disk library store of the signed-in user, or None if unavailable."""
+        with self._library_store_lock:
+            if self._library_store is None:
+                self._library_store = library_store.LibraryStore()
+            if self._current_user_id is None:
+                profile = self._execute_web_api(self.client.current_user)
+                if isinstance(profile, str) or not profile or not profile.get("id"):
+                    return None
+                self._current_user_id = profile["id"]
+                if self._library_store.get_owner() != self._current_user_id:
+                    self._library_store.set_owner(self._current_user_id)
+            return self._library_store
+
+    def _forget_library_items(self, collection, ids):
+        """Removes items we just deleted from the stored collection."""
+        if self._library_store and self._current_user_id:
+            self._library_store.remove(collection, ids)
+        self.invalidate_library_index()
+
+    def invalidate_library_index(self):
+        """Forces the next library search to sync the library and rebuild its index."""
+        self._library_index_time = 0.0
+
+    def _get_library_index(self):
+        """
+        Returns the search index over the user's library, building it when missing or stale.
+        Building syncs the saved collections first, which usually costs one request each.
+        """
+        with self._library_index_lock:
+            if (
+                self._library_index is not None
+                and self._library_index_time
+                and time.monotonic() - self._library_index_time < LIBRARY_INDEX_TTL
+            ):
+                return self._library_index
+
+            collections = [
+                (self.get_saved_tracks, "track"),
+                (self.get_followed_artists, None),
+                (self.get_saved_albums, "album"),
+                (self.get_user_playlists, None),
+                (self.get_saved_shows, "show"),
+            ]
+            items = []
+            for loader, wrapper_key in collections:
+                result = loader()
+                if isinstance(result, str):
+                    return result
+                for entry in result or []:
+                    items.append(entry.get(wrapper_key) if wrapper_key else entry)
+            self._library_index = library_index.LibraryIndex(items)
+            self._library_index_time = time.monotonic()
+            return self._library_index
+
+    def prepare_library_search(self):
+        """Builds the library index ahead of the first library search."""
+        if self.client:
+            self._get_library_index()
+
+    def search_library(self, query, limit=LIBRARY_SEARCH_LIMIT):
+        """Searches track, artist, album, playlist and show names in the user's library locally."""
+        if not self.client:
+            return _("Spotify client not ready. Please validate your credentials.")
+        index = self._get_library_index()
+        if isinstance(index, str):
+            return index
+        return index.search(query, limit)
+
+    def _sync_saved_collection(self, collection, command):
+        """
+        Returns a saved-items collection (tracks, albums or shows), newest first.
+        Only items added since the last sync are downloaded: pages are walked from the
+        newest item and the walk stops at the first one already stored. Everything is
+        downloaded again the first time, and when items were removed elsewhere: the
+        first stored item reached is not the newest one stored, or the merged count
+        disagrees with Spotify's total.
+        """
+        store = self._get_library_store()
+        known = store.load(collection) if store else None
+        if not known:
+            items = self._fetch_all_pages(command, limit=50)
+            if store and not isinstance(items, str):
+                store.replace(collection, items)
+            return items
+
+        newest_added_at = known[0].get("added_at") or ""
+        newest_id = library_store.item_id(known[0])
+        known_ids = {library_store.item_id(item) for item in known}
+        new_items = []
+        total = None
+        boundary = None
         offset = 0
-        limit = 50  # Max limit per request
         while True:
-            results = self._execute_web_api(
-                self.client.current_user_saved_tracks, limit=limit, offset=offset
-            )
-            if isinstance(results, str):
-                return results  # Error message
-
-            if not results or not results.get("items"):
-                break
-            tracks.extend(results["items"])
-            if len(results["items"]) < limit:
+            page = self._execute_web_api(command, limit=50, offset=offset)
+            if isinstance(page, str):
+                return page
+            page = page or {}
+            page_items = page.get("items") or []
+            total = page.get("total")
+            reached_known = False
+            for item in page_items:
+                added_at = item.get("added_at") or ""
+                if added_at < newest_added_at or (
+                    added_at == newest_added_at and library_store.item_id(item) in known_ids
+                ):
+                    boundary = item
+                    reached_known = True
+                    break
+                new_items.append(item)
+            if reached_known or not page.get("next") or not page_items:
                 break
-            offset += limit
-        return tracks
+            offset += len(page_items)
+
+        new_ids = {library_store.item_id(item) for item in new_items}
+        items = new_items + [
+            item for item in known if library_store.item_id(item) not in new_ids
+        ]
+        boundary_moved = boundary is not None and (
+            library_store.item_id(boundary) != newest_id
+            or (boundary.get("added_at") or "") != newest_added_at
+        )
+        if boundary_moved or (total is not None and len(items) != total):
+            log.debug(f"Spotify: Stored '{collection}' is out of date, downloading it again.")
+            items = self._fetch_all_pages(command, limit=50)
+            if isinstance(items, str):
+                return items
+        elif not new_items:
+            return items
+        store.replace(collection, items)
+        return items
+
+    def get_saved_tracks(self):
+        """Fetches all saved tracks from the user's library."""
+        return self._sync_saved_collection("saved_tracks", self.client.current_user_saved_tracks)
 
     def remove_tracks_from_library(self, track_ids):
         """Removes tracks from the user's library."""
-        return self._execute_web_api(
+        result = self._execute_web_api(
             self.client.current_user_saved_tracks_delete, tracks=track_ids
         )
+        if not isinstance(result, str):
+            self._forget_library_items("saved_tracks", track_ids)
+        return result
 
     def save_tracks_to_library(self, track_ids):
         """Saves tracks to the user's library."""
-        return self._execute_web_api(
+        result = self._execute_web_api(
             self.client.current_user_saved_tracks_add, tracks=track_ids
         )
+        if not isinstance(result, str):
+            self.invalidate_library_index()
+        return result
 
     def get_followed_artists(self):
         """Fetches all artists followed by the user."""
@@ -935,11 +2385,17 @@ class SpotifyClient:
 
     def follow_artists(self, artist_ids):
         """Follows one or more artists."""
-        return self._execute_web_api(self.client.user_follow_artists, ids=artist_ids)
+        result = self._execute_web_api(self.client.user_follow_artists, ids=artist_ids)
+        if not isinstance(result, str):
+            self.invalidate_library_index()
+        return result
 
     def unfollow_artists(self, artist_ids):
         """Unfollows one or more artists."""
-        return self._execute_web_api(self.client.user_unfollow_artists, ids=artist_ids)
+        result = self._execute_web_api(self.client.user_unfollow_artists, ids=artist_ids)
+        if not isinstance(result, str):
+            self.invalidate_library_index()
+        return result
 
     def get_top_items(self, item_type="tracks", time_range="medium_term"):
         """Fetches the user's top tracks or artists."""
@@ -956,23 +2412,7 @@ class SpotifyClient:
 
     def get_saved_shows(self):
         """Fetches all saved shows from the user's library."""
-        shows = []
-        offset = 0
-        limit = 50  # Max limit per request
-        while True:
-            results = self._execute_web_api(
-                self.client.current_user_saved_shows, limit=limit, offset=offset
-            )
-            if isinstance(results, str):
-                return results  # Error message
-
-            if not results or not results.get("items"):
-                break
-            shows.extend(results["items"])
-            if len(results["items"]) < limit:
-                break
-            offset += limit
-        return shows
+        return self._sync_saved_collection("saved_shows", self.client.current_user_saved_shows)
 
     def get_new_releases(self):
         """Fetches new album releases."""
@@ -992,49 +2432,59 @@ class SpotifyClient:
 
     def get_artist_albums(self, artist_id):
         """Gets all albums and singles for an artist (paginated)."""
-        limit = 50
-        offset = 0
-        aggregated = {"items": []}
-
-        while True:
-            results = self._execute_web_api(
-                self.client.artist_albums,
-                artist_id=artist_id,
-                album_type="album,single",
-                limit=limit,
-                offset=offset,
-            )
-            if isinstance(results, str):
-                return results
-            items = results.get("items", [])
-            if not items:
-                break
-            aggregated["items"].extend(items)
-            if len(items) < limit:
-                break
-            offset += limit
-        return aggregated
+        items = self._fetch_all_pages(
+            self.client.artist_albums,
+            limit=50,
+            artist_id=artist_id,
+            album_type="album,single",
+        )
+        if isinstance(items, str):
+            return items
+        return {"items": items}
 
     def get_album_tracks(self, album_id):
         """Gets all tracks for a single album."""
-        tracks = []
-        limit = 50
-        offset = 0
+        return self._fetch_all_pages(self.client.album_tracks, limit=50, album_id=album_id)
 
-        while True:
-            results = self._execute_web_api(
-                self.client.album_tracks, album_id=album_id, limit=limit, offset=offset
-            )
-            if isinstance(results, str):
-                return results
-            items = results.get("items", [])
-            if not items:
-                break
-            tracks.extend(items)
-            if len(items) < limit:
-                break
-            offset += limit
-        return tracks
+    def get_albums_tracks(self, album_ids):
+        """
+        Gets the tracks of several albums at once, returned as {album_id: [tracks]}.
+        Uses the several-albums endpoint (20 albums per request, sent concurrently),
+        which already embeds the first page of each album's tracks.
+        """
+        album_ids = [album_id for album_id in album_ids if album_id]
+        batches = [
+            album_ids[i:i + ALBUMS_BATCH_SIZE]
+            for i in range(0, len(album_ids), ALBUMS_BATCH_SIZE)
+        ]
+        lane = self._scheduler.current_lane()
+
+        def fetch_batch(batch):
+            with self._scheduler.lane(lane):
+                return self._execute_web_api(self.client.albums, batch)
+
+        results = utils.map_in_pool(fetch_batch, batches)
+
+        tracks_by_album = {}
+        oversized_albums = []
+        for result in results:
+            if isinstance(result, str):
+                return result
+            for album in (result or {}).get("albums") or []:
+                if not album or not album.get("id"):
+                    continue
+                tracks_page = album.get("tracks") or {}
+                tracks_by_album[album["id"]] = list(tracks_page.get("items") or [])
+                if tracks_page.get("next"):
+                    oversized_albums.append(album["id"])
+
+        # Albums with more tracks than the embedded page are completed separately.
+        for album_id in oversized_albums:
+            tracks = self.get_album_tracks(album_id)
+            if isinstance(tracks, str):
+                return tracks
+            tracks_by_album[album_id] = tracks
+        return tracks_by_album
 
     def get_artist_details(self, artist_id):
         """Gets profile information for the given artist."""
@@ -1058,35 +2508,25 @@ class SpotifyClient:
 
     def get_saved_albums(self):
         """Fetches all saved albums from the user's library."""
-        albums = []
-        offset = 0
-        limit = 50  # Max limit per request
-        while True:
-            results = self._execute_web_api(
-                self.client.current_user_saved_albums, limit=limit, offset=offset
-            )
-            if isinstance(results, str):
-                return results  # Error message
-
-            if not results or not results.get("items"):
-                break
-            albums.extend(results["items"])
-            if len(results["items"]) < limit:
-                break
-            offset += limit
-        return albums
+        return self._sync_saved_collection("saved_albums", self.client.current_user_saved_albums)
 
     def save_albums_to_library(self, album_ids):
         """Saves one or more albums to the user's library."""
-        return self._execute_web_api(
+        result = self._execute_web_api(
             self.client.current_user_saved_albums_add, albums=album_ids
         )
+        if not isinstance(result, str):
+            self.invalidate_library_index()
+        return result
 
     def remove_albums_from_library(self, album_ids):
         """Removes one or more albums from the user's library."""
-        return self._execute_web_api(
+        result = self._execute_web_api(
             self.client.current_user_saved_albums_delete, albums=album_ids
         )
+        if not isinstance(result, str):
+            self._forget_library_items("saved_albums", album_ids)
+        return result
 
     def check_if_albums_saved(self, album_ids):
         """Checks if one or more albums are already in the user's library."""
@@ -1096,15 +2536,21 @@ class SpotifyClient:
 
     def save_shows_to_library(self, show_ids):
         """Saves one or more shows to the user's library."""
-        return self._execute_web_api(
+        result = self._execute_web_api(
             self.client.current_user_saved_shows_add, shows=show_ids
         )
+        if not isinstance(result, str):
+            self.invalidate_library_index()
+        return result
 
     def remove_shows_from_library(self, show_ids):
         """Removes one or more shows from the user's library."""
-        return self._execute_web_api(
+        result = self._execute_web_api(
             self.client.current_user_saved_shows_delete, shows=show_ids
         )
+        if not isinstance(result, str):
+            self._forget_library_items("saved_shows", show_ids)
+        return result
 
     def check_if_artists_followed(self, artist_ids):
         """Checks if the current user is following one or more artists."""
@@ -1114,15 +2560,21 @@ class SpotifyClient:
 
     def follow_playlist(self, playlist_id):
         """Follows a playlist."""
-        return self._execute_web_api(
+        result = self._execute_web_api(
             self.client.current_user_follow_playlist, playlist_id=playlist_id
         )
+        if not isinstance(result, str):
+            self.invalidate_library_index()
+        return result
 
     def unfollow_playlist(self, playlist_id):
         """Unfollows a playlist."""
-        return self._execute_web_api(
+        result = self._execute_web_api(
             self.client.current_user_unfollow_playlist, playlist_id=playlist_id
         )
+        if not isinstance(result, str):
+            self.invalidate_library_index()
+        return result
 
     def check_if_playlist_is_followed(self, playlist_id, user_ids):
         """Checks if one or more users are following a playlist."""
@@ -1341,6 +2793,11 @@ class SpotifyClient:
 
     def transfer_playback_to_device(self, device_id):
         """Transfers playback to a specific device ID."""
-        return self._execute_web_api(
+        result = self._execute_web_api(
             self.client.transfer_playback, device_id=device_id, force_play=False
-        )
\ No newline at end of file
+        )
+        if not isinstance(result, str):
+            self.device_id = device_id
+            self._device_resolved_at = time.monotonic()
+            self.invalidate_playback_cache()
+        return result
\ No newline at end of file
@@ -0,0 +1,257 @@
+# task_pool.py
+
+import collections
+import threading
+from concurrent.futures import Future
+
+from logHandler import log
+
+# Worker threads shared by gestures and dialogs.
+DEFAULT_WORKERS = 6
+# A warning is logged when this many tasks are waiting, so a runaway caller shows up in the log.
+QUEUE_WARNING_DEPTH = 50
+
+_local = threading.local()
+
+
+def current_token():
+    """Returns the cancellation token of the task running on this thread, or None outside the pool."""
+    return getattr(_local, "token", None)
+
+
+class CancellationToken:
+    """
+    Tells a task that its result is no longer wanted. A task that has not started
+    when it is cancelled never runs; a running task checks the token between steps.
+    is_set() lets a token be passed wherever a threading.Event is expected.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def is_set(self):
+        return self._event.is_set()
+
+    def wait(self, timeout=None):
+        return self._event.wait(timeout)
+
+
+class _Task:
+    __slots__ = ("func", "args", "kwargs", "key", "token", "future")
+
+    def __init__(self, func, args, kwargs, key, future=None):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.key = key
+        self.token = CancellationToken()
+        self.future = future
+
+
+class TaskPool:
+    """
+    Runs the add-on's background work on a fixed number of worker threads.
+    Tasks sharing a key run one at a time, in the order they were submitted.
+    With latest_wins, a new task replaces those still waiting under its key and
+    cancels the one running, so only the most recent request is carried out.
+    max_pending limits how many tasks may wait behind the running one;
+    submit() returns None instead of a token when the key is full.
+    submit_future() and map() hand results back to the caller instead.
+    """
+
+    def __init__(self, max_workers=DEFAULT_WORKERS, name="AccessifyWorker"):
+        self._max_workers = max_workers
+        self._name = name
+        self._lock = threading.Lock()
+        self._work_available = threading.Condition(self._lock)
+        self._ready = collections.deque()
+        self._heads = {}  # key -> task that is ready or running
+        self._waiting = {}  # key -> deque of tasks queued behind the head
+        self._workers = 0
+        self._idle = 0
+        self._busy = 0
+        self._stopping = False
+        self._counters = collections.Counter()
+        self._peak_queued = 0
+        self._warned = False
+
+    def submit(self, func, args=(), kwargs=None, key=None, latest_wins=False, max_pending=None):
+        """Queues func(*args, **kwargs) and returns its CancellationToken."""
+        task = _Task(func, tuple(args), dict(kwargs or {}), key)
+        if not self._enqueue(task, latest_wins, max_pending):
+            return None
+        return task.token
+
+    def submit_future(self, func, args=(), kwargs=None):
+        """Queues func(*args, **kwargs) and returns a concurrent.futures.Future for its result."""
+        task = _Task(func, tuple(args), dict(kwargs or {}), None, Future())
+        self._enqueue(task)
+        return task.future
+
+    def map(self, func, items):
+        """
+        Runs func on every item concurrently and returns the results in order.
+        Items no worker has picked up yet are run on the calling thread, so a task
+        already running on the pool can use map() without waiting for a free worker.
+        """
+        items = list(items)
+        futures = [self.submit_future(func, (item,)) for item in items]
+        results = []
+        for item, future in zip(items, futures):
+            if future.cancel():
+                results.append(func(item))
+            else:
+                results.append(future.result())
+        return results
+
+    def _enqueue(self, task, latest_wins=False, max_pending=None):
+        key = task.key
+        with self._lock:
+            self._stopping = False
+            if key is None:
+                self._ready.append(task)
+            elif key not in self._heads:
+                self._heads[key] = task
+                self._ready.append(task)
+            else:
+                waiting = self._waiting.setdefault(key, collections.deque())
+                if latest_wins:
+                    for superseded in waiting:
+                        superseded.token.cancel()
+                    self._counters["cancelled"] += len(waiting)
+                    waiting.clear()
+                    self._heads[key].token.cancel()
+                elif max_pending is not None and len(waiting) >= max_pending:
+                    self._counters["rejected"] += 1
+                    return False
+                waiting.append(task)
+            self._counters["submitted"] += 1
+            self._note_queue_depth()
+            if self._idle < len(self._ready) and self._workers < self._max_workers:
+                self._start_worker()
+            self._work_available.notify()
+        return True
+
+    def _note_queue_depth(self):
+        queued = self._queued_count()
+        self._peak_queued = max(self._peak_queued, queued)
+        if queued >= QUEUE_WARNING_DEPTH and not self._warned:
+            self._warned = True
+            log.debugWarning(f"Spotify: {queued} background tasks are waiting to run.")
+        elif queued < QUEUE_WARNING_DEPTH // 2:
+            self._warned = False
+
+    def _queued_count(self):
+        return len(self._ready) + sum(len(waiting) for waiting in self._waiting.values())
+
+    def _start_worker(self):
+        self._workers += 1
+        thread = threading.Thread(target=self._run, name=f"{self._name}-{self._workers}")
+        thread.daemon = True
+        thread.start()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._ready and not self._stopping:
+                    self._idle += 1
+                    self._work_available.wait()
+                    self._idle -= 1
+                if not self._ready:
+                    self._workers -= 1
+                    return
+                task = self._ready.popleft()
+                self._busy += 1
+            outcome = self._run_task(task)
+            with self._lock:
+                self._busy -= 1
+                self._counters[outcome] += 1
+                self._advance(task)
+
+    def _run_task(self, task):
+        """Runs a task and returns the name of the counter recording how it ended."""
+        future = task.future
+        if task.token.cancelled:
+            if future:
+                future.cancel()
+            return "skipped"
+        if future and not future.set_running_or_notify_cancel():
+            return "skipped"
+        _local.token = task.token
+        try:
+            result = task.func(*task.args, **task.kwargs)
+        except Exception as e:
+            if future:
+                future.set_exception(e)
+            else:
+                log.error(f"Spotify: Background task {getattr(task.func, '__name__', task.func)} failed.", exc_info=True)
+            return "failed"
+        finally:
+            _local.token = None
+        if future:
+            future.set_result(result)
+        return "completed"
+
+    def _advance(self, task):
+        """Hands the key of a finished task to the next task waiting under it."""
+        if task.key is None or self._heads.get(task.key) is not task:
+            return
+        waiting = self._waiting.get(task.key)
+        if waiting:
+            next_task = waiting.popleft()
+            self._heads[task.key] = next_task
+            self._ready.append(next_task)
+            self._work_available.notify()
+        else:
+            self._heads.pop(task.key, None)
+            self._waiting.pop(task.key, None)
+
+    def cancel(self, key):
+        """Cancels every task queued or running under a key."""
+        with self._lock:
+            head = self._heads.get(key)
+            if head:
+                head.token.cancel()
+            for task in self._waiting.get(key, ()):
+                task.token.cancel()
+
+    def stats(self):
+        """Returns queue-depth metrics: worker counts, tasks waiting overall and per key, and totals."""
+        with self._lock:
+            return {
+                "workers": self._workers,
+                "busy": self._busy,
+                "queued": self._queued_count(),
+                "peak_queued": self._peak_queued,
+                "keys": {
+                    key: 1 + len(self._waiting.get(key, ()))
+                    for key in self._heads
+                },
+                **self._counters,
+            }
+
+    def shutdown(self):
+        """
+        Cancels all queued work and lets the workers exit once their current task ends.
+        The pool starts new workers if more tasks are submitted afterwards.
+        """
+        with self._lock:
+            self._stopping = True
+            for task in self._ready:
+                task.token.cancel()
+                if task.future:
+                    task.future.cancel()
+            for head in self._heads.values():
+                head.token.cancel()
+            for waiting in self._waiting.values():
+                for task in waiting:
+                    task.token.cancel()
+                waiting.clear()
+            self._work_available.notify_all()
@@ -15,6 +15,7 @@ import time
 from gui import messageBox
 from logHandler import log
 import gui
+from . import utils
 
 
 # Constants for the GitHub repository
@@ -27,7 +28,7 @@ def check_for_updates(is_manual=False):
         if not config.conf["spotify"]["isAutomaticallyCheckForUpdates"]:
             return
 
-    threading.Thread(target=_perform_check, args=(is_manual,)).start()
+    utils.submit(_perform_check, args=(is_manual,), background=True)
 
 
 def _parse_version(version_string):
@@ -165,6 +166,7 @@ class UpdateDialog(wx.Frame):
         self.update_button.Disable()
         self.cancel_button.Disable()
         self.info_text.SetValue(_("Downloading update... Please wait."))
+        # The download can take minutes, so it gets its own thread instead of a pool worker.
         threading.Thread(target=download_and_install, args=[self.release_info]).start()
 
 def show_update_dialog(release_info):
@@ -1,27 +1,83 @@
 # accesifyPlay/utils.py
 
-import threading
 import wx
 import ui
 from functools import wraps
 from logHandler import log
+from . import task_pool
 
-def run_in_thread(func):
+# Key shared by every task that changes playback, so those commands never overlap.
+PLAYBACK_TASK_KEY = "playback"
+# Worker threads for long jobs (startup, bulk queueing, library loading, paging),
+# kept apart so they can never hold up the workers that answer gestures.
+BACKGROUND_WORKERS = 4
+
+# Satu pool bersama untuk semua gesture dan dialog, agar jumlah thread tetap terbatas.
+_pool = task_pool.TaskPool()
+_background_pool = task_pool.TaskPool(BACKGROUND_WORKERS, name="AccessifyBackground")
+
+def _get_pool(background):
+    return _background_pool if background else _pool
+
+def current_token():
+    """Returns the cancellation token of the task running on this thread, or None."""
+    return task_pool.current_token()
+
+def submit(target, args=(), kwargs=None, key=None, latest_wins=False, max_pending=None, background=False):
+    """
+    Runs target on a shared worker pool and returns its CancellationToken.
+    Pass background=True for long jobs nobody is waiting on right away.
+    See TaskPool.submit for the meaning of key, latest_wins and max_pending.
+    """
+    return _get_pool(background).submit(
+        target, args, kwargs, key=key, latest_wins=latest_wins, max_pending=max_pending
+    )
+
+def submit_future(target, args=(), kwargs=None, background=False):
+    """Runs target on a shared worker pool and returns a Future for its result."""
+    return _get_pool(background).submit_future(target, args, kwargs)
+
+def map_in_pool(func, items, background=True):
+    """Runs func on every item on a shared worker pool and returns the results in order."""
+    return _get_pool(background).map(func, items)
+
+def cancel_tasks(key, background=False):
+    _get_pool(background).cancel(key)
+
+def get_task_stats():
+    """Returns the queue-depth metrics of the gesture and background worker pools."""
+    return {"gestures": _pool.stats(), "background": _background_pool.stats()}
+
+def shutdown_tasks():
+    _pool.shutdown()
+    _background_pool.shutdown()
+
+def _decorator_with_options(decorator):
+    """Lets a decorator be used both bare and with keyword options, e.g. @speak_in_thread(key=...)."""
+    @wraps(decorator)
+    def wrapper(func=None, **options):
+        if func is None:
+            return lambda f: decorator(f, **options)
+        return decorator(func, **options)
+    return wrapper
+
+@_decorator_with_options
+def run_in_thread(func, key=None, latest_wins=False, background=False):
     """
     Decorator untuk menjalankan fungsi di background thread tanpa menangani output.
     Berguna untuk tugas yang tidak perlu memberikan feedback langsung.
     """
     @wraps(func)
     def wrapper(*args, **kwargs):
-        thread = threading.Thread(target=func, args=args, kwargs=kwargs)
-        thread.daemon = True
-        thread.start()
+        submit(func, args, kwargs, key=key, latest_wins=latest_wins, background=background)
     return wrapper
 
-def speak_in_thread(func):
+@_decorator_with_options
+def speak_in_thread(func, key=None, latest_wins=False, max_pending=None):
     """
     Decorator yang menjalankan fungsi di background thread dan 
     mengucapkan (speak) hasilnya melalui ui.message.
+    When max_pending tasks are already waiting under the key, "Please wait..." is spoken instead.
     """
     @wraps(func)
     def wrapper(self, *args, **kwargs):
@@ -34,7 +90,8 @@ def speak_in_thread(func):
                 log.error(f"Error in threaded function {func.__name__}: {e}", exc_info=True)
                 wx.CallAfter(ui.message, _("An unexpected error occurred."))
 
-        threading.Thread(target=thread_target).start()
+        if submit(thread_target, key=key, latest_wins=latest_wins, max_pending=max_pending) is None:
+            ui.message(_("Please wait..."))
     return wrapper
 
 def copy_in_thread(func):
@@ -56,5 +113,5 @@ def copy_in_thread(func):
                 log.error(f"Error in copy_in_thread for {func.__name__}: {e}", exc_info=True)
                 wx.CallAfter(ui.message, _("An unexpected error occurred."))
 
-        threading.Thread(target=thread_target).start()
+        submit(thread_target)
     return wrapper
\ No newline at end of file